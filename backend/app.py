@@ -1,15 +1,26 @@
-import json
+import hmac
 import logging
 import math
+import operator
+import os
 import random
 import re
+import threading
+import time
+import uuid
 from enum import Enum
-from pathlib import Path
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import List, Optional, Tuple, Union
 
-from flask import Flask, request, jsonify
+from flask import Blueprint, Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
 
+from knowledge_io import gzip_stream, import_records, iter_ndjson, iter_records, knowledge_page, parse_cursor
+from log_config import restart_after_fork, setup_logging
+from metrics import ERRORS, HTTP_LATENCY, HTTP_REQUESTS, KNOWLEDGE_SIZE, MESSAGE_LATENCY, REGISTRY
+from sessions import SessionStore
+from storage import KnowledgeStorage, create_storage, normalize_question
+
 
 class ConversationState(Enum):
     NORMAL = "normal"
@@ -17,6 +28,15 @@ class ConversationState(Enum):
     CALCULATING = "calculating"
 
 
+class ConversationSession:
+    """Stan rozmowy jednego klienta"""
+    __slots__ = ('state', 'last_question')
+
+    def __init__(self):
+        self.state = ConversationState.NORMAL
+        self.last_question: Optional[str] = None
+
+
 class ESFJPersonality:
     GREETING_TEMPLATES = [
         "Hej! 😊",
@@ -58,232 +78,453 @@ class ESFJPersonality:
         return random.choice(ESFJPersonality.GRATITUDE_TEMPLATES)
 
 
+class MathLimitExceeded(Exception):
+    """Działanie przekracza limity zasobów - odrzucane bez liczenia"""
+
+
 class MathProcessor:
-    def __init__(self):
+    # Jedno przejście wyrażenia regularnego zamiast składania liczb znak po znaku
+    TOKEN_RE = re.compile(r'[\d.]+|[-+*/^()]')
+
+    def __init__(self, cache_size: int = 1024, max_length: int = 200, max_depth: int = 20,
+                 max_exponent: float = 1000, max_result: float = 1e15, time_budget: float = 0.05):
         self.operations = {
-            '+': lambda x, y: x + y,
-            '-': lambda x, y: x - y,
-            '*': lambda x, y: x * y,
-            '/': lambda x, y: x / y,
-            '^': lambda x, y: x ** y,
-            'sqrt': lambda x: math.sqrt(x)
+            '+': operator.add,
+            '-': operator.sub,
+            '*': operator.mul,
+            '/': operator.truediv,
+            '^': self._power,
         }
         self.precedence = {'+': 1, '-': 1, '*': 2, '/': 2, '^': 3}
+        self.max_length = max_length
+        self.max_depth = max_depth
+        self.max_exponent = max_exponent
+        self.max_result = max_result
+        self.time_budget = time_budget
+        # Skompilowane wyrażenia i wyniki, kluczem jest wyrażenie bez białych znaków
+        self.compile = lru_cache(maxsize=cache_size)(self._compile)
+        self._evaluate = lru_cache(maxsize=cache_size)(self._evaluate_uncached)
 
     def evaluate(self, expression: str) -> Optional[float]:
+        """Liczy wyrażenie; None gdy jest niepoprawne, MathLimitExceeded gdy przekracza limity"""
+        if len(expression) > self.max_length:
+            raise MathLimitExceeded(f"wyrażenie dłuższe niż {self.max_length} znaków")
+        return self._evaluate(''.join(expression.split()))
+
+    def _evaluate_uncached(self, expression: str) -> Optional[float]:
         try:
-            tokens = self._tokenize(expression)
-            if not tokens:
+            rpn = self.compile(expression)
+            if not rpn:
                 return None
-            result = self._evaluate_tokens(tokens)
-            return round(float(result), 4)
-        except:
+            return round(float(self._run(rpn)), 4)
+        except (ArithmeticError, IndexError, TypeError, ValueError):
             return None
 
-    def _tokenize(self, expression: str) -> List[str]:
-        expression = expression.replace(' ', '')
-        tokens = []
-        i = 0
-        while i < len(expression):
-            if expression[i].isdigit() or expression[i] == '.':
-                num = ''
-                while i < len(expression) and (expression[i].isdigit() or expression[i] == '.'):
-                    num += expression[i]
-                    i += 1
-                tokens.append(num)
-                i -= 1
-            elif expression[i] in '+-*/^()':
-                tokens.append(expression[i])
-            i += 1
-        return tokens
-
-    def _evaluate_tokens(self, tokens: List[str]) -> float:
-        values = []
-        operators = []
-
-        for token in tokens:
-            if self._is_number(token):
-                values.append(float(token))
-            elif token == '(':
+    def _power(self, base: float, exponent: float) -> float:
+        if abs(exponent) > self.max_exponent:
+            raise MathLimitExceeded(f"wykładnik większy niż {self.max_exponent:g}")
+        # Sprawdzamy rząd wielkości wyniku, zanim go policzymy
+        if base and exponent * math.log10(abs(base)) > math.log10(self.max_result):
+            raise MathLimitExceeded(f"wynik większy niż {self.max_result:g}")
+        return base ** exponent
+
+    def _compile(self, expression: str) -> Tuple[Union[float, str], ...]:
+        """Zamienia wyrażenie na postać ONP (algorytm stacji rozrządowej)"""
+        output: List[Union[float, str]] = []
+        operators: List[str] = []
+
+        depth = 0
+        for token in self.TOKEN_RE.findall(expression):
+            if token == '(':
+                depth += 1
+                if depth > self.max_depth:
+                    raise MathLimitExceeded(f"zagnieżdżenie nawiasów głębsze niż {self.max_depth}")
                 operators.append(token)
             elif token == ')':
-                while operators and operators[-1] != '(':
-                    self._apply_operator(operators, values)
+                while operators[-1] != '(':
+                    output.append(operators.pop())
                 operators.pop()
-            else:
-                while (operators and operators[-1] != '(' and
-                       self.precedence.get(operators[-1], 0) >= self.precedence.get(token, 0)):
-                    self._apply_operator(operators, values)
+                depth -= 1
+            elif token in self.precedence:
+                precedence = self.precedence[token]
+                while operators and operators[-1] != '(' and self.precedence[operators[-1]] >= precedence:
+                    output.append(operators.pop())
                 operators.append(token)
+            else:
+                output.append(float(token))
 
-        while operators:
-            self._apply_operator(operators, values)
+        # Niezamknięte nawiasy na końcu są pomijane, tak jak wcześniej
+        output.extend(token for token in reversed(operators) if token != '(')
 
+        return tuple(output)
+
+    def _run(self, rpn: Tuple[Union[float, str], ...]) -> float:
+        operations = self.operations
+        max_result = self.max_result
+        deadline = time.perf_counter() + self.time_budget
+        values: List[float] = []
+        for item in rpn:
+            if item.__class__ is float:
+                values.append(item)
+            else:
+                b = values.pop()
+                result = operations[item](values[-1], b)
+                if abs(result) > max_result:
+                    raise MathLimitExceeded(f"wynik większy niż {max_result:g}")
+                if time.perf_counter() > deadline:
+                    raise MathLimitExceeded("przekroczony czas liczenia")
+                values[-1] = result
+        if len(values) != 1:
+            raise ValueError("Niepełne wyrażenie")
         return values[0]
 
-    def _is_number(self, token: str) -> bool:
-        try:
-            float(token)
-            return True
-        except ValueError:
-            return False
 
-    def _apply_operator(self, operators: List[str], values: List[float]):
-        operator = operators.pop()
-        if operator in self.operations:
-            b = values.pop()
-            a = values.pop()
-            values.append(self.operations[operator](a, b))
+MATH_COMMAND_RE = re.compile(r'(policz|oblicz)\s*([\d\+\-\*/\(\)\^\s]+)')
 
 
 class DawidAI:
-    def __init__(self, data_file: str = "dawid_data.json"):
+    DEFAULT_SESSION = "default"
+
+    def __init__(self, data_file: Optional[str] = None, storage_backend: str = "json",
+                 storage: Optional[KnowledgeStorage] = None, max_sessions: int = 10000,
+                 session_ttl: float = 30 * 60, fuzzy_threshold: Optional[float] = None):
         self.personality = ESFJPersonality()
         self.math_processor = MathProcessor()
-        self.data_file = Path(data_file)
-        self.knowledge_base: Dict[str, List[str]] = {}
-        self.state = ConversationState.NORMAL
-        self.last_question: Optional[str] = None
-        self.load_knowledge()
+        # Minimalne podobieństwo trigramowe dla dopasowania przybliżonego (None wyłącza). Domyślnie
+        # wyłączone: krótkie pytania różniące się jednym słowem ("kto to jest" / "co to jest" - 0.73,
+        # "gdzie mieszkasz" / "gdzie mieszkam" - 0.84) mają podobieństwo jak literówki (0.85-0.9),
+        # a pytanie dopasowane do cudzego nigdy nie trafi do nauki
+        self.fuzzy_threshold = fuzzy_threshold
+        self.sessions: SessionStore[ConversationSession] = SessionStore(ConversationSession, max_sessions, session_ttl)
+        # Logowanie przed ładowaniem, żeby komunikaty z odtwarzania dziennika trafiły do pliku
         self.setup_logging()
+        self.storage = storage if storage is not None else create_storage(storage_backend, data_file)
+
+    @property
+    def knowledge_base(self) -> KnowledgeStorage:
+        return self.storage
 
     def setup_logging(self):
-        logging.basicConfig(
-            filename='dawid.log',
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s'
-        )
+        setup_logging('dawid.log', json_lines=os.environ.get('DAWID_LOG_FORMAT') == 'json')
 
     def load_knowledge(self):
-        if self.data_file.exists():
-            try:
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.knowledge_base = data.get('knowledge_base', {})
-            except Exception as e:
-                logging.error(f"Błąd podczas ładowania wiedzy: {e}")
-                print("Wystąpił błąd podczas ładowania wiedzy. Zaczynam od nowa!")
+        self.storage.load()
 
     def save_knowledge(self):
-        try:
-            data = {
-                'knowledge_base': self.knowledge_base,
-            }
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logging.error(f"Błąd podczas zapisywania wiedzy: {e}")
-
-    def process_message(self, message: str) -> dict:
-        """Przetwarza wiadomość i zwraca odpowiedź wraz ze stanem"""
-        if self.state == ConversationState.LEARNING:
+        self.storage.save()
+
+    def flush(self):
+        """Zapisuje zaległe zmiany zgłoszone do zapisu w tle"""
+        self.storage.flush()
+
+    def close(self):
+        self.storage.close()
+
+    def after_fork(self):
+        """Przywraca wątki tła (zapis wiedzy, logowanie) w procesie potomnym"""
+        restart_after_fork()
+        self.storage.after_fork()
+
+    def process_message(self, message: str, session_id: Optional[str] = None) -> dict:
+        """Przetwarza wiadomość w ramach sesji klienta i zwraca odpowiedź wraz ze stanem"""
+        start = time.perf_counter()
+        session = self.sessions.get(session_id or self.DEFAULT_SESSION)
+        branch, result = self._process_message(message, session)
+        MESSAGE_LATENCY.observe(time.perf_counter() - start, branch)
+        return result
+
+    def _process_message(self, message: str, session: ConversationSession) -> Tuple[str, dict]:
+        """Zwraca nazwę ścieżki, którą poszła wiadomość (do metryk), i odpowiedź"""
+        if session.state == ConversationState.LEARNING:
             if message.lower() == 'skip':
-                self.state = ConversationState.NORMAL
-                return {
+                session.state = ConversationState.NORMAL
+                return 'skip', {
                     'response': "Okej, nie ma sprawy! 😊",
                     'state': 'normal'
                 }
 
-            self._learn(self.last_question, message)
-            self.state = ConversationState.NORMAL
-            return {
+            self._learn(session.last_question, message)
+            session.state = ConversationState.NORMAL
+            return 'learn', {
                 'response': self.personality.get_gratitude(),
                 'state': 'normal'
             }
 
-        math_match = re.search(r'(policz|oblicz)\s*([\d\+\-\*/\(\)\^\s]+)', message.lower())
+        math_match = MATH_COMMAND_RE.search(message.lower())
         if math_match:
             expression = math_match.group(2)
-            result = self.math_processor.evaluate(expression)
+            try:
+                result = self.math_processor.evaluate(expression)
+            except MathLimitExceeded as e:
+                logging.warning(f"Odrzucono działanie: {e}")
+                return 'math_rejected', {
+                    'response': f"To działanie jest dla mnie za duże 😅 ({e})",
+                    'state': 'normal'
+                }
             if result is not None:
-                return {
+                return 'math', {
                     'response': f"Wynik działania {expression} = {result} 📊",
                     'state': 'normal'
                 }
-            return {
+            return 'math', {
                 'response': "Przepraszam, ale nie mogę wykonać tego działania 😅",
                 'state': 'normal'
             }
 
         response = self._get_response(message)
         if response:
-            return {
+            return 'answer', {
                 'response': response,
                 'state': 'normal'
             }
 
-        self.state = ConversationState.LEARNING
-        self.last_question = message
-        return {
+        session.state = ConversationState.LEARNING
+        session.last_question = message
+        return 'learning', {
             'response': self.personality.get_learning_request(),
             'state': 'learning'
         }
 
     def _learn(self, question: str, answer: str):
-        cleaned_question = re.sub(r'[^\w\s]', '', question.lower()).strip()
-
-        if cleaned_question in self.knowledge_base:
-            if answer not in self.knowledge_base[cleaned_question]:
-                self.knowledge_base[cleaned_question].append(answer)
-        else:
-            self.knowledge_base[cleaned_question] = [answer]
-
-        self.save_knowledge()
+        cleaned_question = normalize_question(question)
+        if not self.storage.add_answer(cleaned_question, answer):
+            return
         logging.info(f"Nauczona odpowiedź: {cleaned_question} -> {answer}")
 
     def _get_response(self, question: str) -> Optional[str]:
-        cleaned_question = re.sub(r'[^\w\s]', '', question.lower()).strip()
+        cleaned_question = normalize_question(question)
+        answers = self.storage.get_answers(cleaned_question)
+        if not answers and self.fuzzy_threshold:
+            similar_question = self.storage.find_similar(cleaned_question, self.fuzzy_threshold)
+            if similar_question is not None:
+                answers = self.storage.get_answers(similar_question)
+        if not answers:
+            return None
 
-        for stored_question, answers in self.knowledge_base.items():
-            cleaned_stored = re.sub(r'[^\w\s]', '', stored_question.lower()).strip()
-            if cleaned_question == cleaned_stored:
-                response = random.choice(answers)
-                self.save_knowledge()
-                return response
+        return random.choice(answers)
 
-        return None
 
+CORS_ORIGINS = [
+    "http://localhost:5173",
+    "http://localhost:4173",
+    "https://jestem-dawid.netlify.app",
+    "http://192.168.1.144",
+    "http://100.113.203.25"
+]
 
-app = Flask(__name__)
-CORS(app, resources={
-    r"/*": {
-        "origins": [
-            "http://localhost:5173",
-            "http://localhost:4173",
-            "https://jestem-dawid.netlify.app",
-            "http://192.168.1.144",
-            "http://100.113.203.25"
-        ]
-    }
-})
+api = Blueprint('api', __name__)
 
-# Inicjalizacja Dawida jako globalnej zmiennej
-dawid = DawidAI()
+_dawid: Optional[DawidAI] = None
+_dawid_lock = threading.Lock()
 
 
-@app.route('/chat', methods=['POST'])
-def chat():
-    try:
-        data = request.json
-        if not data:
-            return jsonify({'response': 'Nie otrzymałem danych... 😕', 'state': 'normal'})
+def get_dawid() -> DawidAI:
+    """Dawid tworzony przy pierwszym użyciu - sam import modułu nie wczytuje wiedzy ani nie konfiguruje logowania.
+
+    DAWID_STORAGE=sqlite pozwala współdzielić wiedzę między workerami gunicorna,
+    a DAWID_STORAGE=mmap startuje bez parsowania JSON-a (indeks dawid_data.idx).
+    DAWID_FUZZY_THRESHOLD (np. 0.9) włącza dopasowanie przybliżonych pytań.
+    """
+    global _dawid
+    if _dawid is None:
+        with _dawid_lock:
+            if _dawid is None:
+                dawid = DawidAI(os.environ.get('DAWID_DATA_FILE'), os.environ.get('DAWID_STORAGE', 'json'),
+                                fuzzy_threshold=float(os.environ.get('DAWID_FUZZY_THRESHOLD', 0)) or None)
+                _dawid = dawid
+    return _dawid
+
+
+# Przez get_dawid, a nie przy jego tworzeniu - inaczej przed pierwszym /chat metryka pokazywałaby 0
+KNOWLEDGE_SIZE.callback = lambda: len(get_dawid().knowledge_base)
+
+
+def create_app(preload: bool = False) -> Flask:
+    """Fabryka aplikacji; preload=True wczytuje wiedzę od razu (gunicorn --preload, patrz gunicorn.conf.py)"""
+    flask_app = Flask(__name__)
+    CORS(flask_app, resources={
+        r"/*": {
+            "origins": CORS_ORIGINS
+        }
+    })
+    flask_app.register_blueprint(api)
+    if preload:
+        get_dawid()
+    return flask_app
+
+
+SESSION_COOKIE = 'dawid_session'
+MAX_SESSION_ID_LENGTH = 128
+MAX_BATCH_SIZE = 100
+
+
+def valid_session_id(session_id) -> Optional[str]:
+    if isinstance(session_id, str) and 0 < len(session_id) <= MAX_SESSION_ID_LENGTH:
+        return session_id
+    return None
 
-        message = data.get('message', '')
 
-        if not message:
-            return jsonify({'response': 'Nie otrzymałem wiadomości... 😕', 'state': 'normal'})
+def resolve_session_id(data: dict, cookie_session_id: Optional[str]) -> str:
+    """Id sesji z payloadu, z ciasteczka albo nowe"""
+    return (valid_session_id(data.get('session_id'))
+            or valid_session_id(cookie_session_id)
+            or uuid.uuid4().hex)
 
-        result = dawid.process_message(message)
-        return jsonify(result)
+
+def get_session_id(data: dict) -> str:
+    return resolve_session_id(data, request.cookies.get(SESSION_COOKIE))
+
+
+def handle_chat(data, cookie_session_id: Optional[str]) -> Tuple[dict, Optional[str]]:
+    """Logika /chat niezależna od serwera: zwraca odpowiedź i id sesji (o ile powstała)"""
+    if not data:
+        return {'response': 'Nie otrzymałem danych... 😕', 'state': 'normal'}, None
+
+    message = data.get('message', '')
+
+    if not message:
+        return {'response': 'Nie otrzymałem wiadomości... 😕', 'state': 'normal'}, None
+
+    session_id = resolve_session_id(data, cookie_session_id)
+    result = get_dawid().process_message(message, session_id)
+    return {**result, 'session_id': session_id}, session_id
+
+
+def session_response(payload: dict, session_id: str):
+    response = jsonify({**payload, 'session_id': session_id})
+    response.set_cookie(SESSION_COOKIE, session_id, max_age=int(get_dawid().sessions.ttl), httponly=True,
+                        samesite='None', secure=True)
+    return response
+
+
+@api.route('/chat', methods=['POST'])
+def chat():
+    try:
+        result, session_id = handle_chat(request.json, request.cookies.get(SESSION_COOKIE))
+        if session_id is None:
+            return jsonify(result)
+        return session_response(result, session_id)
     except Exception as e:
+        ERRORS.inc('/chat')
         logging.error(f"Błąd w /chat: {e}")
         return jsonify({'response': 'Wystąpił błąd serwera... 😰', 'state': 'normal'}), 500
 
 
-@app.route('/health', methods=['GET'])
+@api.route('/chat/batch', methods=['POST'])
+def chat_batch():
+    """Przetwarza po kolei listę wiadomości - tekstów albo obiektów {message, session_id}"""
+    try:
+        data = request.get_json(silent=True)
+        messages = data.get('messages') if isinstance(data, dict) else None
+        if not isinstance(messages, list):
+            return jsonify({'error': 'Oczekiwano listy "messages"'}), 400
+        if len(messages) > MAX_BATCH_SIZE:
+            return jsonify({'error': f'Maksymalnie {MAX_BATCH_SIZE} wiadomości w jednym żądaniu'}), 413
+
+        default_session_id = get_session_id(data)
+        results = []
+        for item in messages:
+            if isinstance(item, dict):
+                message = item.get('message', '')
+                session_id = valid_session_id(item.get('session_id')) or default_session_id
+            else:
+                message, session_id = item, default_session_id
+
+            if not message or not isinstance(message, str):
+                result = {'response': 'Nie otrzymałem wiadomości... 😕', 'state': 'normal'}
+            else:
+                result = get_dawid().process_message(message, session_id)
+            results.append({**result, 'session_id': session_id})
+
+        return session_response({'results': results}, default_session_id)
+    except Exception as e:
+        ERRORS.inc('/chat/batch')
+        logging.error(f"Błąd w /chat/batch: {e}")
+        return jsonify({'error': 'Wystąpił błąd serwera... 😰'}), 500
+
+
+@api.route('/health', methods=['GET'])
 def health_check():
     return jsonify({'status': 'ok'})
 
 
+def is_admin() -> bool:
+    """Nagłówek Authorization: Bearer <DAWID_ADMIN_TOKEN>; bez ustawionego tokenu dostęp jest zamknięty"""
+    token = os.environ.get('DAWID_ADMIN_TOKEN')
+    if not token:
+        return False
+    provided = request.headers.get('Authorization', '')
+    return hmac.compare_digest(provided.encode('utf-8'), f'Bearer {token}'.encode('utf-8'))
+
+
+@api.route('/knowledge', methods=['GET'])
+def knowledge():
+    """Podgląd bazy wiedzy: strony z kursorem albo pełny eksport NDJSON (?format=ndjson).
+
+    Baza zawiera to, czego uczyli użytkownicy, więc odczyt wymaga tego samego tokenu co import.
+    """
+    if not is_admin():
+        return jsonify({'error': 'Brak uprawnień'}), 403
+
+    prefix = request.args.get('prefix', '').lower()
+    storage = get_dawid().knowledge_base
+
+    if request.args.get('format') == 'ndjson':
+        chunks = iter_ndjson(storage, prefix)
+        headers = {}
+        if 'gzip' in request.headers.get('Accept-Encoding', ''):
+            chunks = gzip_stream(chunks)
+            headers['Content-Encoding'] = 'gzip'
+        return Response(stream_with_context(chunks), mimetype='application/x-ndjson', headers=headers)
+
+    page = knowledge_page(storage, parse_cursor(request.args.get('cursor')),
+                          request.args.get('limit', 100, type=int), prefix)
+    return jsonify({**page, 'total': len(storage)})
+
+
+@api.route('/knowledge/import', methods=['POST'])
+def knowledge_import():
+    """Masowy import wiedzy: treść NDJSON albo CSV (Content-Type: text/csv), czytana strumieniowo"""
+    if not is_admin():
+        return jsonify({'error': 'Brak uprawnień'}), 403
+
+    fmt = 'csv' if request.mimetype == 'text/csv' else 'ndjson'
+    storage = get_dawid().knowledge_base
+    try:
+        # Linia po linii, bez TextIOWrappera - pod gunicornem request.stream to jego surowy Body,
+        # który nie ma interfejsu io (readable() itd.)
+        lines = (line.decode('utf-8') for line in request.stream)
+        stats = import_records(storage, iter_records(lines, fmt))
+    except UnicodeDecodeError:
+        return jsonify({'error': 'Treść musi być w UTF-8'}), 400
+    except Exception as e:
+        ERRORS.inc('/knowledge/import')
+        logging.error(f"Błąd w /knowledge/import: {e}")
+        return jsonify({'error': 'Wystąpił błąd serwera... 😰'}), 500
+
+    logging.info(f"Import wiedzy ({fmt}): {stats['records']} rekordów, {stats['added']} nowych odpowiedzi")
+    return jsonify({**stats, 'total': len(storage)})
+
+
+@api.route('/metrics', methods=['GET'])
+def metrics():
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+
+@api.before_app_request
+def start_timer():
+    g.request_start = time.perf_counter()
+
+
+@api.after_app_request
+def record_request(response):
+    endpoint = request.url_rule.rule if request.url_rule else 'other'
+    HTTP_REQUESTS.inc(endpoint, str(response.status_code))
+    HTTP_LATENCY.observe(time.perf_counter() - g.request_start, endpoint)
+    return response
+
+
+app = create_app()
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=False)
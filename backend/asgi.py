@@ -0,0 +1,175 @@
+"""
+Asynchroniczny tryb serwowania Dawida (ASGI)
+============================================
+Ten sam kontrakt /chat, /health i /metrics co aplikacja Flask, ale jeden proces
+obsługuje wiele równoczesnych połączeń - wolni klienci nie blokują workerów:
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5000
+
+Przetwarzanie wiadomości (w tym zapis dziennika i SQLite) idzie do małej
+puli wątków, więc pętla zdarzeń nigdy nie czeka na dysk.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.cookies import SimpleCookie
+from typing import List, Optional, Tuple
+
+from app import CORS_ORIGINS, SESSION_COOKIE, get_dawid, handle_chat
+from metrics import ERRORS, HTTP_LATENCY, HTTP_REQUESTS, REGISTRY
+
+MAX_BODY_SIZE = 64 * 1024
+
+executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="dawid-asgi")
+
+
+async def read_body(receive) -> bytes:
+    body = b''
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get('body', b'')
+        if len(body) > MAX_BODY_SIZE:
+            raise ValueError("Zbyt duże żądanie")
+        more_body = message.get('more_body', False)
+    return body
+
+
+def get_header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope['headers']:
+        if key == name:
+            return value.decode('latin-1')
+    return None
+
+
+def cors_headers(scope) -> List[Tuple[bytes, bytes]]:
+    origin = get_header(scope, b'origin')
+    if origin in CORS_ORIGINS:
+        return [(b'access-control-allow-origin', origin.encode('latin-1')), (b'vary', b'Origin')]
+    return []
+
+
+def session_cookie(session_id: str) -> bytes:
+    cookie = SimpleCookie()
+    cookie[SESSION_COOKIE] = session_id
+    morsel = cookie[SESSION_COOKIE]
+    morsel['max-age'] = int(get_dawid().sessions.ttl)
+    morsel['path'] = '/'
+    morsel['httponly'] = True
+    morsel['secure'] = True
+    morsel['samesite'] = 'None'
+    return morsel.OutputString().encode('latin-1')
+
+
+async def send_json(send, scope, payload: dict, status: int = 200, extra_headers=()):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    headers = [
+        (b'content-type', b'application/json; charset=utf-8'),
+        (b'content-length', str(len(body)).encode()),
+        *cors_headers(scope),
+        *extra_headers,
+    ]
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def chat(scope, receive, send):
+    try:
+        body = await read_body(receive)
+    except ValueError:
+        await send_json(send, scope, {'response': 'Wiadomość jest za długa... 😕', 'state': 'normal'}, 413)
+        return
+    try:
+        data = json.loads(body or b'null')
+    except ValueError:
+        data = None
+
+    cookie_header = get_header(scope, b'cookie')
+    cookies = SimpleCookie(cookie_header) if cookie_header else {}
+    cookie_session_id = cookies[SESSION_COOKIE].value if SESSION_COOKIE in cookies else None
+
+    try:
+        loop = asyncio.get_running_loop()
+        result, session_id = await loop.run_in_executor(executor, handle_chat, data, cookie_session_id)
+    except Exception as e:
+        ERRORS.inc('/chat')
+        logging.error(f"Błąd w /chat (ASGI): {e}")
+        await send_json(send, scope, {'response': 'Wystąpił błąd serwera... 😰', 'state': 'normal'}, 500)
+        return
+
+    extra_headers = [(b'set-cookie', session_cookie(session_id))] if session_id else []
+    await send_json(send, scope, result, extra_headers=extra_headers)
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            # Wiedza wczytana przed pierwszym żądaniem, a nie w jego trakcie
+            await asyncio.get_running_loop().run_in_executor(executor, get_dawid)
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            # Ostatni zapis wiedzy również poza pętlą zdarzeń
+            await asyncio.get_running_loop().run_in_executor(executor, get_dawid().close)
+            executor.shutdown(wait=True)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def send_metrics(send):
+    body = REGISTRY.render().encode('utf-8')
+    headers = [(b'content-type', b'text/plain; version=0.0.4'), (b'content-length', str(len(body)).encode())]
+    await send({'type': 'http.response.start', 'status': 200, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+
+    start = time.perf_counter()
+    status = 500
+
+    async def send_and_record(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+        await send(message)
+
+    await route(scope, receive, send_and_record)
+
+    endpoint = scope['path'] if scope['path'] in ('/chat', '/health', '/metrics') else 'other'
+    HTTP_REQUESTS.inc(endpoint, str(status))
+    HTTP_LATENCY.observe(time.perf_counter() - start, endpoint)
+
+
+async def route(scope, receive, send):
+    path, method = scope['path'], scope['method']
+    if method == 'OPTIONS':
+        headers = [
+            *cors_headers(scope),
+            (b'access-control-allow-methods', b'GET, POST, OPTIONS'),
+            (b'access-control-allow-headers', b'Content-Type'),
+        ]
+        await send({'type': 'http.response.start', 'status': 204, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': b''})
+    elif path == '/health' and method == 'GET':
+        await send_json(send, scope, {'status': 'ok'})
+    elif path == '/chat' and method == 'POST':
+        await chat(scope, receive, send)
+    elif path == '/metrics' and method == 'GET':
+        await send_metrics(send)
+    else:
+        await send_json(send, scope, {'error': 'Nie znaleziono'}, 404)
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    uvicorn.run(app, host='0.0.0.0', port=5000)
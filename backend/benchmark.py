@@ -0,0 +1,514 @@
+#!/usr/bin/env python3
+"""
+Benchmarki backendu Dawida
+==========================
+Uruchamiane offline, bez serwera HTTP:
+
+    python benchmark.py lookup --sizes 10,1000,100000,1000000
+    python benchmark.py lookup --storage sqlite
+    python benchmark.py stress --threads 1,2,4,8
+    python benchmark.py math
+    python benchmark.py memory --sizes 100000,1000000
+    python benchmark.py startup --size 100000 --workers 4
+    python benchmark.py suite --output wyniki.json
+
+Podkomenda suite zbiera wszystkie gorące ścieżki w jednym przebiegu i zapisuje
+wyniki (p50/p99, przepustowość) jako JSON, żeby porównywać kolejne uruchomienia.
+"""
+
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+from typing import List, Optional
+
+from app import DawidAI, MathProcessor
+from log_config import setup_logging
+from storage import AnswerPool, JsonStorage, SqliteStorage
+
+# Ile razy mierzyć flush w bench_suite - każdy pomiar poprzedza jedna nauka
+FLUSH_SAMPLES = 20
+# W aplikacji domyślnie wyłączone; tu włączone, żeby pudło mierzyło też wyszukiwanie przybliżone
+FUZZY_THRESHOLD = 0.9
+
+
+class LegacyMathProcessor:
+    """Poprzednia wersja MathProcessor - punkt odniesienia dla benchmarku"""
+
+    def __init__(self):
+        self.operations = {
+            '+': lambda x, y: x + y,
+            '-': lambda x, y: x - y,
+            '*': lambda x, y: x * y,
+            '/': lambda x, y: x / y,
+            '^': lambda x, y: x ** y,
+            'sqrt': lambda x: math.sqrt(x)
+        }
+        self.precedence = {'+': 1, '-': 1, '*': 2, '/': 2, '^': 3}
+
+    def evaluate(self, expression: str) -> Optional[float]:
+        try:
+            tokens = self._tokenize(expression)
+            if not tokens:
+                return None
+            result = self._evaluate_tokens(tokens)
+            return round(float(result), 4)
+        except Exception:
+            return None
+
+    def _tokenize(self, expression: str) -> List[str]:
+        expression = expression.replace(' ', '')
+        tokens = []
+        i = 0
+        while i < len(expression):
+            if expression[i].isdigit() or expression[i] == '.':
+                num = ''
+                while i < len(expression) and (expression[i].isdigit() or expression[i] == '.'):
+                    num += expression[i]
+                    i += 1
+                tokens.append(num)
+                i -= 1
+            elif expression[i] in '+-*/^()':
+                tokens.append(expression[i])
+            i += 1
+        return tokens
+
+    def _evaluate_tokens(self, tokens: List[str]) -> float:
+        values = []
+        operators = []
+
+        for token in tokens:
+            if self._is_number(token):
+                values.append(float(token))
+            elif token == '(':
+                operators.append(token)
+            elif token == ')':
+                while operators and operators[-1] != '(':
+                    self._apply_operator(operators, values)
+                operators.pop()
+            else:
+                while (operators and operators[-1] != '(' and
+                       self.precedence.get(operators[-1], 0) >= self.precedence.get(token, 0)):
+                    self._apply_operator(operators, values)
+                operators.append(token)
+
+        while operators:
+            self._apply_operator(operators, values)
+
+        return values[0]
+
+    def _is_number(self, token: str) -> bool:
+        try:
+            float(token)
+            return True
+        except ValueError:
+            return False
+
+    def _apply_operator(self, operators: List[str], values: List[float]):
+        operator = operators.pop()
+        if operator in self.operations:
+            b = values.pop()
+            a = values.pop()
+            values.append(self.operations[operator](a, b))
+
+
+def write_seed(size: int, data_dir: str) -> Path:
+    """Zapisuje syntetyczną bazę wiedzy o zadanym rozmiarze do podanego katalogu"""
+    seed_file = Path(data_dir) / "dawid_data.json"
+    with open(seed_file, 'w', encoding='utf-8') as f:
+        json.dump({'knowledge_base': {f"pytanie numer {i}": [f"odpowiedz {i}"] for i in range(size)}}, f)
+    return seed_file
+
+
+def build_dawid(size: int, data_dir: str, storage_backend: str = "json") -> DawidAI:
+    """Tworzy DawidAI z syntetyczną bazą wiedzy o zadanym rozmiarze; pliki trafiają do data_dir"""
+    seed_file = write_seed(size, data_dir)
+    data_dir = seed_file.parent
+
+    if storage_backend == "sqlite":
+        return DawidAI(storage=SqliteStorage(str(data_dir / "dawid_data.db"), seed_file=str(seed_file)),
+                       fuzzy_threshold=FUZZY_THRESHOLD)
+    return DawidAI(str(seed_file), fuzzy_threshold=FUZZY_THRESHOLD)
+
+
+def bench_lookup(sizes, iterations: int, storage_backend: str):
+    print(f"{'rozmiar':>10} {'trafienie [µs]':>16} {'pudło [µs]':>12}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as data_dir:
+            dawid = build_dawid(size, data_dir, storage_backend)
+            hits = [f"Pytanie numer {random.randrange(size)}?" for _ in range(iterations)]
+            misses = [f"Nieznane pytanie {i}!" for i in range(iterations)]
+
+            start = time.perf_counter()
+            for question in hits:
+                dawid._get_response(question)
+            hit_us = (time.perf_counter() - start) / iterations * 1e6
+
+            start = time.perf_counter()
+            for question in misses:
+                dawid._get_response(question)
+            miss_us = (time.perf_counter() - start) / iterations * 1e6
+            dawid.close()
+
+        print(f"{size:>10} {hit_us:>16.2f} {miss_us:>12.2f}")
+
+
+def bench_stress(size: int, thread_counts, operations: int, storage_backend: str):
+    """Wiele wątków naraz woła process_message: 90% odczytów, 10% nauki.
+
+    Każda odpowiedź jest sprawdzana, a na końcu także rozmiar bazy wiedzy.
+    """
+    print(f"{'wątki':>6} {'wiadomości/s':>14} {'błędy':>7}")
+    for threads in thread_counts:
+        with tempfile.TemporaryDirectory() as data_dir:
+            dawid = build_dawid(size, data_dir, storage_backend)
+            barrier = threading.Barrier(threads + 1)
+            errors = []
+            calls = [0] * threads
+
+            def worker(worker_id: int):
+                session_id = f"stress-{worker_id}"
+                rng = random.Random(worker_id)
+                barrier.wait()
+                try:
+                    for i in range(operations):
+                        if i % 10 == 0:
+                            # Losowe pytanie, żeby dopasowanie przybliżone nie trafiło w poprzednie
+                            question = f"nowe {uuid.UUID(int=rng.getrandbits(128)).hex}"
+                            answer = f"odpowiedź {worker_id}-{i}"
+                            if dawid.process_message(question, session_id)['state'] != 'learning':
+                                errors.append(f"{question}: brak trybu nauki")
+                            dawid.process_message(answer, session_id)
+                            if dawid.process_message(question, session_id)['response'] != answer:
+                                errors.append(f"{question}: zła odpowiedź po nauce")
+                            calls[worker_id] += 3
+                        else:
+                            n = rng.randrange(size)
+                            if dawid.process_message(f"pytanie numer {n}", session_id)['response'] != f"odpowiedz {n}":
+                                errors.append(f"pytanie numer {n}: zła odpowiedź")
+                            calls[worker_id] += 1
+                except Exception as e:
+                    errors.append(repr(e))
+
+            workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+            for thread in workers:
+                thread.start()
+            barrier.wait()
+            start = time.perf_counter()
+            for thread in workers:
+                thread.join()
+            elapsed = time.perf_counter() - start
+
+            expected_size = size + threads * len(range(0, operations, 10))
+            if len(dawid.knowledge_base) != expected_size:
+                errors.append(f"rozmiar bazy {len(dawid.knowledge_base)} zamiast {expected_size}")
+
+            dawid.close()
+            print(f"{threads:>6} {sum(calls) / elapsed:>14.0f} {len(errors):>7}")
+            for error in errors[:5]:
+                print(f"    {error}")
+
+
+def bench_math(iterations: int):
+    """Porównanie starego i nowego MathProcessor (z pamięcią podręczną i bez)"""
+    expressions = [
+        "2+2",
+        "(12.5*4-3)/7^2",
+        "((1+2)*(3+4)-(5-6)/(7+8))^2*3.14159-2/3",
+        "+".join(f"{i}*({i}+1)" for i in range(50)),
+    ]
+    legacy = LegacyMathProcessor()
+    for expression in expressions:
+        if legacy.evaluate(expression) != MathProcessor(max_length=10000).evaluate(expression):
+            print(f"Różne wyniki dla {expression}!")
+
+    print(f"{'długość':>8} {'stary [µs]':>12} {'nowy bez cache [µs]':>20} {'nowy z cache [µs]':>18}")
+    for expression in expressions:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            legacy.evaluate(expression)
+        legacy_us = (time.perf_counter() - start) / iterations * 1e6
+
+        uncached = MathProcessor(cache_size=0, max_length=10000)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            uncached.evaluate(expression)
+        uncached_us = (time.perf_counter() - start) / iterations * 1e6
+
+        cached = MathProcessor(max_length=10000)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            cached.evaluate(expression)
+        cached_us = (time.perf_counter() - start) / iterations * 1e6
+
+        print(f"{len(expression):>8} {legacy_us:>12.2f} {uncached_us:>20.2f} {cached_us:>18.2f}")
+
+
+def synthetic_corpus(size: int) -> dict:
+    """Baza podobna do prawdziwej: 1-3 odpowiedzi na pytanie, część z nich powtarza się w wielu pytaniach"""
+    rng = random.Random(size)
+    common = [f"hejka {i}" for i in range(200)]
+    knowledge_base = {}
+    for i in range(size):
+        answers = []
+        for j in range(rng.choice((1, 1, 1, 2, 3))):
+            answers.append(rng.choice(common) if rng.random() < 0.4 else f"odpowiedz {i} {j}")
+        knowledge_base[f"pytanie numer {i}"] = answers
+    return {'knowledge_base': knowledge_base}
+
+
+def measure(build) -> int:
+    """Pamięć (w bajtach) zajęta przez obiekt zwrócony z build, po zwolnieniu danych pośrednich"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return used
+
+
+def bench_memory(sizes):
+    """Pamięć na wpis: słownik list (poprzedni format) i pula odpowiedzi z numerami"""
+    print(f"{'rozmiar':>10} {'dict-of-lists [B/wpis]':>24} {'pula odpowiedzi [B/wpis]':>26} {'oszczędność':>12}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as data_dir:
+            data_file = Path(data_dir) / "dawid_data.json"
+            with open(data_file, 'w', encoding='utf-8') as f:
+                json.dump(synthetic_corpus(size), f)
+
+            def load_legacy():
+                with open(data_file, encoding='utf-8') as f:
+                    return json.load(f)['knowledge_base']
+
+            def load_compact():
+                pool, knowledge_base = AnswerPool(), {}
+                for question, answers in load_legacy().items():
+                    for answer in answers:
+                        JsonStorage._merge(pool, knowledge_base, question, answer)
+                return pool, knowledge_base
+
+            legacy = measure(load_legacy) / size
+            compact = measure(load_compact) / size
+        print(f"{size:>10} {legacy:>24.1f} {compact:>26.1f} {1 - compact / legacy:>11.0%}")
+
+
+def private_memory_kb() -> int:
+    """Pamięć prywatna procesu (USS) - strony współdzielone z rodzicem się nie liczą"""
+    total = 0
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            if line.startswith(('Private_Clean:', 'Private_Dirty:')):
+                total += int(line.split()[1])
+    return total
+
+
+def worker_memory(workers: int, size: int, seed_file: Path, preloaded: Optional[DawidAI]) -> float:
+    """Średnia pamięć prywatna workerów po forku, po obsłużeniu zapytań i przebiegu GC.
+
+    Bez preloaded każdy worker wczytuje wiedzę sam.
+    """
+    results = []
+    for _ in range(workers):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            dawid = preloaded or DawidAI(str(seed_file))
+            dawid.after_fork()
+            for i in range(0, size, max(1, size // 1000)):
+                dawid._get_response(f"pytanie numer {i}")
+            gc.collect()
+            os.write(write_fd, str(private_memory_kb()).encode())
+            os._exit(0)
+        os.close(write_fd)
+        with os.fdopen(read_fd) as f:
+            results.append(int(f.read()))
+        os.waitpid(pid, 0)
+    return sum(results) / len(results) / 1024
+
+
+def bench_startup(size: int, workers: int):
+    """Czas importu app.py i pamięć prywatna workerów: bez preload, z preload, z preload i gc.freeze"""
+    with tempfile.TemporaryDirectory() as data_dir:
+        seed_file = write_seed(size, data_dir)
+        env = {**os.environ, 'DAWID_DATA_FILE': str(seed_file)}
+        backend_dir = Path(__file__).resolve().parent
+
+        def timed(code: str) -> float:
+            script = f"import time; start = time.perf_counter(); {code}; print(time.perf_counter() - start)"
+            output = subprocess.run([sys.executable, '-c', script], cwd=seed_file.parent, env=env,
+                                    capture_output=True, text=True, check=True).stdout
+            return float(output.split()[-1])
+
+        sys_path = f"import sys; sys.path.insert(0, {str(backend_dir)!r})"
+        lazy = timed(f"{sys_path}; import app")
+        eager = timed(f"{sys_path}; import app; app.get_dawid()")
+        print(f"rozmiar bazy: {size}")
+        print(f"  import app (leniwie):              {lazy * 1000:>8.1f} ms")
+        print(f"  import app + wczytanie wiedzy:     {eager * 1000:>8.1f} ms")
+
+        print(f"{'tryb':>24} {'pamięć prywatna workera [MB]':>30}")
+        print(f"{'bez preload':>24} {worker_memory(workers, size, seed_file, None):>30.1f}")
+        # Jak w gunicorn.conf.py: wczytanie bez GC, zamrożenie przed forkiem
+        gc.disable()
+        preloaded = DawidAI(str(seed_file))
+        gc.enable()
+        print(f"{'preload':>24} {worker_memory(workers, size, seed_file, preloaded):>30.1f}")
+        gc.freeze()
+        print(f"{'preload + gc.freeze':>24} {worker_memory(workers, size, seed_file, preloaded):>30.1f}")
+        gc.unfreeze()
+        gc.enable()
+        preloaded.close()
+
+
+def latency_stats(samples_ns: List[int]) -> dict:
+    """p50/p99 w mikrosekundach i przepustowość dla czasów pojedynczych wywołań"""
+    samples_ns = sorted(samples_ns)
+    count = len(samples_ns)
+    return {
+        'count': count,
+        'p50_us': round(samples_ns[count // 2] / 1000, 3),
+        'p99_us': round(samples_ns[min(count - 1, count * 99 // 100)] / 1000, 3),
+        'ops_per_sec': round(count / (sum(samples_ns) / 1e9), 1),
+    }
+
+
+def time_calls(operation, inputs, prepare=None) -> dict:
+    """Czasy pojedynczych wywołań; prepare(item), jeśli podane, działa przed pomiarem i się nie liczy"""
+    samples = []
+    for item in inputs:
+        if prepare:
+            prepare(item)
+        start = time.perf_counter_ns()
+        operation(item)
+        samples.append(time.perf_counter_ns() - start)
+    return latency_stats(samples)
+
+
+def math_expression(terms: int) -> str:
+    """Wyrażenie z zadaną liczbą składników, z nawiasami i wszystkimi operatorami"""
+    operators = "+-*/"
+    parts = [f"({i + 1}.5{operators[i % 4]}{i + 2})" for i in range(terms)]
+    return "+".join(parts)
+
+
+def bench_suite(sizes, iterations: int, storage_backend: str, expression_terms, output: Optional[str]):
+    random.seed(0)
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'storage': storage_backend,
+            'iterations': iterations,
+        },
+        'knowledge': [],
+        'math': [],
+    }
+
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as data_dir:
+            dawid = build_dawid(size, data_dir, storage_backend)
+            hits = [f"Pytanie numer {random.randrange(size)}?" for _ in range(iterations)]
+            misses = [f"Nieznane pytanie {i}!" for i in range(iterations)]
+            new_questions = [f"nowe pytanie {uuid.uuid4().hex}" for _ in range(iterations)]
+
+            entry = {
+                'size': size,
+                'get_response_hit': time_calls(dawid._get_response, hits),
+                'get_response_miss': time_calls(dawid._get_response, misses),
+                'process_message_hit': time_calls(lambda message: dawid.process_message(message, "suite"), hits),
+                'learn': time_calls(lambda question: dawid._learn(question, "odpowiedz"), new_questions),
+            }
+            # Koszt trwałości: zaległy zapis po jednej nauce i pełny snapshot bazy
+            flush_questions = [f"pytanie do zapisu {uuid.uuid4().hex}" for _ in range(FLUSH_SAMPLES)]
+            entry['flush'] = time_calls(lambda _: dawid.flush(), flush_questions,
+                                        prepare=lambda question: dawid._learn(question, "odpowiedz"))
+            entry['save'] = time_calls(lambda _: dawid.save_knowledge(), range(3))
+            dawid.close()
+        results['knowledge'].append(entry)
+        print(f"rozmiar {size}: gotowe", file=sys.stderr)
+
+    for terms in expression_terms:
+        expression = math_expression(terms)
+        uncached = MathProcessor(cache_size=0, max_length=10000)
+        cached = MathProcessor(max_length=10000)
+        results['math'].append({
+            'terms': terms,
+            'length': len(expression),
+            'evaluate_uncached': time_calls(uncached.evaluate, [expression] * iterations),
+            'evaluate_cached': time_calls(cached.evaluate, [expression] * iterations),
+        })
+
+    report = json.dumps(results, indent=2, ensure_ascii=False)
+    if output:
+        Path(output).write_text(report + '\n', encoding='utf-8')
+    else:
+        print(report)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarki backendu Dawida")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    lookup = subparsers.add_parser("lookup", help="czas _get_response w zależności od rozmiaru bazy")
+    lookup.add_argument("--sizes", default="10,1000,100000,1000000")
+    lookup.add_argument("--iterations", type=int, default=20000)
+    lookup.add_argument("--storage", choices=["json", "sqlite"], default="json")
+
+    stress = subparsers.add_parser("stress", help="process_message z wielu wątków naraz")
+    stress.add_argument("--size", type=int, default=100000)
+    stress.add_argument("--threads", default="1,2,4,8")
+    stress.add_argument("--operations", type=int, default=5000, help="wiadomości na wątek")
+    stress.add_argument("--storage", choices=["json", "sqlite"], default="json")
+
+    math_parser = subparsers.add_parser("math", help="stary i nowy MathProcessor.evaluate")
+    math_parser.add_argument("--iterations", type=int, default=20000)
+
+    memory = subparsers.add_parser("memory", help="pamięć na wpis bazy wiedzy (tracemalloc)")
+    memory.add_argument("--sizes", default="100000,1000000")
+
+    startup = subparsers.add_parser("startup", help="czas startu i pamięć workerów po forku (Linux)")
+    startup.add_argument("--size", type=int, default=100000)
+    startup.add_argument("--workers", type=int, default=4)
+
+    suite = subparsers.add_parser("suite", help="wszystkie gorące ścieżki, wyniki jako JSON")
+    suite.add_argument("--sizes", default="10,1000,100000,1000000")
+    suite.add_argument("--iterations", type=int, default=5000)
+    suite.add_argument("--storage", choices=["json", "sqlite"], default="json")
+    suite.add_argument("--terms", default="1,4,16,64", help="liczby składników wyrażeń matematycznych")
+    suite.add_argument("--output", help="plik wynikowy (domyślnie standardowe wyjście)")
+
+    args = parser.parse_args()
+    # Logi do pliku, jak w aplikacji - magazyn SQLite loguje, zanim powstanie DawidAI
+    setup_logging('dawid.log')
+    if args.command == "lookup":
+        bench_lookup([int(size) for size in args.sizes.split(",")], args.iterations, args.storage)
+    elif args.command == "stress":
+        bench_stress(args.size, [int(threads) for threads in args.threads.split(",")], args.operations, args.storage)
+    elif args.command == "math":
+        bench_math(args.iterations)
+    elif args.command == "memory":
+        bench_memory([int(size) for size in args.sizes.split(",")])
+    elif args.command == "startup":
+        bench_startup(args.size, args.workers)
+    elif args.command == "suite":
+        bench_suite([int(size) for size in args.sizes.split(",")], args.iterations, args.storage,
+                    [int(terms) for terms in args.terms.split(",")], args.output)
+
+
+if __name__ == "__main__":
+    main()
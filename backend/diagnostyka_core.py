@@ -0,0 +1,536 @@
+"""
+Rdzeń diagnostyki Dawida (bez GUI)
+==================================
+Sprawdzenia współdzielone przez okno diagnostyki i tryb bez ekranu: sondowanie
+adresów, test obciążenia, trwałe połączenie SSH, migawka stanu Pi i konfiguracja.
+Moduł nie importuje tkintera, więc działa z crona i na serwerze bez wyświetlacza.
+"""
+
+import json
+import platform
+import queue
+import socket
+import subprocess
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+import requests
+
+CONFIG_FILE = Path.home() / ".dawid_diagnostics_config.json"
+DEFAULT_CONFIG = {
+    "ip_addresses": ["192.168.1.144", "172.17.0.1", "100.113.203.25"],
+    "port": 5000,
+    "ssh_alias": "frpi",  # Twój alias SSH
+    "ssh_user": "filip",
+    "last_working_ip": None,
+    "use_ssh_alias": True,
+    "load_test_concurrency": 8,
+    "load_test_duration": 10
+}
+
+IS_WINDOWS = platform.system() == "Windows"
+
+LOAD_TEST_MESSAGES = ["test obciążeniowy", "oblicz 12*(3+4)"]
+PROBE_TIMEOUT = 3.0
+
+
+def probe_endpoint(ip, port, timeout=PROBE_TIMEOUT):
+    """Połączenie TCP, a potem GET /health - bez uruchamiania ping/PowerShell. Zwraca (ok, opis)."""
+    try:
+        with socket.create_connection((ip, port), timeout=timeout):
+            pass
+    except OSError as e:
+        return False, f"Port {port} zamknięty ({e})"
+
+    try:
+        response = requests.get(f"http://{ip}:{port}/health", timeout=timeout)
+    except requests.RequestException:
+        return False, "HTTP failed"
+    if response.status_code != 200:
+        return False, f"HTTP {response.status_code}"
+    return True, "Working!"
+
+
+def find_first_healthy(ips, port, timeout=PROBE_TIMEOUT, log=print):
+    """Sprawdza wszystkie adresy naraz; wygrywa pierwszy zdrowy, na resztę nie czekamy"""
+    if not ips:
+        return None
+    executor = ThreadPoolExecutor(max_workers=len(ips), thread_name_prefix="probe")
+    pending = {executor.submit(probe_endpoint, ip, port, timeout): ip for ip in ips}
+    try:
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                ip = pending.pop(future)
+                ok, detail = future.result()
+                if ok:
+                    log(f"  ✅ {ip}: {detail}", "SUCCESS")
+                    return ip
+                log(f"  ❌ {ip}: {detail}", "ERROR")
+        return None
+    finally:
+        # Trwające sondy kończą się same po timeoucie - nie blokujemy na nich
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def percentile(sorted_values, fraction):
+    """Percentyl z posortowanej listy (metoda najbliższego rzędu)"""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return round(sorted_values[index], 2)
+
+
+def latency_summary(latencies):
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99),
+    }
+
+
+def run_load_test(base_url, concurrency=8, duration=10.0, chat_ratio=0.5, timeout=10, log=print):
+    """Równoległe obciążenie /chat i /health przez `duration` sekund.
+
+    Każdy wątek ma własną sesję HTTP (keep-alive) i własne, jednorazowe session_id.
+    Gdy Dawid zapyta o odpowiedź (stan "learning"), wątek wysyła "skip" - test
+    niczego nie dopisuje do bazy wiedzy.
+    """
+    results = {"/chat": [], "/health": []}
+    errors = {"/chat": 0, "/health": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def request(http, endpoint, payload=None):
+        start = time.perf_counter()
+        try:
+            if payload is None:
+                response = http.get(f"{base_url}{endpoint}", timeout=timeout)
+            else:
+                response = http.post(f"{base_url}{endpoint}", json=payload, timeout=timeout)
+            ok = response.status_code == 200
+            data = response.json() if ok and payload is not None else None
+        except (requests.RequestException, ValueError):
+            ok, data = False, None
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with lock:
+            if ok:
+                results[endpoint].append(elapsed_ms)
+            else:
+                errors[endpoint] += 1
+        return data
+
+    def worker(worker_id):
+        session_id = f"diagnostyka-{uuid.uuid4().hex}"
+        with requests.Session() as http:
+            sent = 0
+            chat_credit = 0.0
+            while time.perf_counter() < deadline:
+                # Równomierny przeplot: na każde zapytanie przypada chat_ratio zapytania do /chat
+                chat_credit += chat_ratio
+                if chat_credit >= 1:
+                    chat_credit -= 1
+                    message = LOAD_TEST_MESSAGES[(worker_id + sent) % len(LOAD_TEST_MESSAGES)]
+                    data = request(http, "/chat", {"message": message, "session_id": session_id})
+                    if data and data.get("state") == "learning":
+                        request(http, "/chat", {"message": "skip", "session_id": session_id})
+                else:
+                    request(http, "/health")
+                sent += 1
+
+    log(f"🔥 Test obciążenia: {base_url}, {concurrency} wątków, {duration:.0f}s")
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    total_ok = sum(len(latencies) for latencies in results.values())
+    total_errors = sum(errors.values())
+    total = total_ok + total_errors
+    report = {
+        "base_url": base_url,
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 2),
+        "requests": total,
+        "errors": total_errors,
+        "error_rate": round(total_errors / total, 4) if total else 0.0,
+        "rps": round(total / elapsed, 1) if elapsed else 0.0,
+        "latency": latency_summary([ms for latencies in results.values() for ms in latencies]),
+        "endpoints": {
+            endpoint: {**latency_summary(latencies), "errors": errors[endpoint]}
+            for endpoint, latencies in results.items()
+        },
+    }
+    return report
+
+
+SSH_OPTIONS = [
+    'ConnectTimeout=10',
+    'ServerAliveInterval=5',
+    'ServerAliveCountMax=2',
+    'StrictHostKeyChecking=no',
+    'LogLevel=ERROR',
+    'BatchMode=yes',
+    'PasswordAuthentication=no',
+]
+
+
+# Zbiera stan Pi jednym wywołaniem i zwraca jeden dokument JSON. Czyta wprost
+# z /proc, więc nie zależy od formatu wyjścia ps/netstat/free ani od sudo.
+REMOTE_COLLECTOR = r"""
+import json, os, sys, time
+
+port, app_dir, log_lines = int(sys.argv[1]), os.path.expanduser(sys.argv[2]), int(sys.argv[3])
+
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+
+def processes():
+    result = []
+    for pid in filter(str.isdigit, os.listdir('/proc')):
+        if int(pid) == os.getpid():
+            continue
+        try:
+            argv = read('/proc/%s/cmdline' % pid).split('\0')
+            if not any(name in os.path.basename(argv[0]) for name in ('python', 'gunicorn', 'uvicorn')):
+                continue
+            cmdline = ' '.join(argv).strip()
+            rss = [line.split()[1] for line in read('/proc/%s/status' % pid).splitlines()
+                   if line.startswith('VmRSS:')]
+        except OSError:
+            continue
+        result.append({'pid': int(pid), 'cmdline': cmdline, 'rss_mb': round(int(rss[0]) / 1024, 1) if rss else None,
+                       'dawid': any(name in cmdline for name in ('app.py', 'app:', 'asgi'))})
+    return result
+
+
+def socket_owners():
+    owners = {}
+    for pid in filter(str.isdigit, os.listdir('/proc')):
+        try:
+            for fd in os.listdir('/proc/%s/fd' % pid):
+                target = os.readlink('/proc/%s/fd/%s' % (pid, fd))
+                if target.startswith('socket:['):
+                    owners[target[8:-1]] = int(pid)
+        except OSError:
+            continue
+    return owners
+
+
+def listening():
+    result = []
+    owners = None
+    for path in ('/proc/net/tcp', '/proc/net/tcp6'):
+        try:
+            lines = read(path).splitlines()[1:]
+        except OSError:
+            continue
+        for line in lines:
+            fields = line.split()
+            address, state, inode = fields[1], fields[3], fields[9]
+            if state != '0A' or int(address.rsplit(':', 1)[1], 16) != port:
+                continue
+            if owners is None:
+                owners = socket_owners()
+            result.append({'address': address, 'pid': owners.get(inode)})
+    return result
+
+
+def memory():
+    info = {}
+    for line in read('/proc/meminfo').splitlines():
+        key, value = line.split(':', 1)
+        info[key] = int(value.split()[0]) // 1024
+    return {'total_mb': info['MemTotal'], 'available_mb': info.get('MemAvailable', info['MemFree']),
+            'swap_total_mb': info.get('SwapTotal', 0), 'swap_free_mb': info.get('SwapFree', 0)}
+
+
+def cpu():
+    def sample():
+        values = [int(value) for value in read('/proc/stat').splitlines()[0].split()[1:]]
+        return sum(values), values[3] + values[4]
+
+    total_before, idle_before = sample()
+    time.sleep(0.2)
+    total_after, idle_after = sample()
+    busy = 1 - (idle_after - idle_before) / max(1, total_after - total_before)
+    result = {'usage_percent': round(busy * 100, 1), 'load': [float(value) for value in read('/proc/loadavg').split()[:3]],
+              'count': os.cpu_count()}
+    try:
+        result['temperature_c'] = int(read('/sys/class/thermal/thermal_zone0/temp')) / 1000
+    except (OSError, ValueError):
+        pass
+    return result
+
+
+def disk():
+    stat = os.statvfs(app_dir if os.path.isdir(app_dir) else os.path.expanduser('~'))
+    total, free = stat.f_blocks * stat.f_frsize, stat.f_bavail * stat.f_frsize
+    return {'total_mb': total // 2 ** 20, 'free_mb': free // 2 ** 20,
+            'used_percent': round(100 * (1 - free / total), 1) if total else None}
+
+
+def log_tail():
+    try:
+        with open(os.path.join(app_dir, 'dawid.log'), 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - 64 * 1024))
+            return f.read().decode('utf-8', 'replace').splitlines()[-log_lines:]
+    except OSError:
+        return None
+
+
+snapshot = {'time': time.time(), 'uptime_s': float(read('/proc/uptime').split()[0])}
+for name, collect in (('processes', processes), ('listening', listening), ('memory', memory),
+                      ('cpu', cpu), ('disk', disk), ('log_tail', log_tail)):
+    try:
+        snapshot[name] = collect()
+    except Exception as e:
+        snapshot[name] = {'error': str(e)}
+print(json.dumps(snapshot))
+"""
+
+# Progi ostrzeżeń dla migawki stanu systemu
+MEMORY_AVAILABLE_WARNING = 0.15  # ułamek wolnej pamięci (Pi Zero ma 512 MB)
+DISK_USED_WARNING = 90.0  # procent zajętego dysku
+
+
+def remote_snapshot_command(port, app_dir="~/dawid-app", log_lines=10):
+    """Komenda powłoki uruchamiająca REMOTE_COLLECTOR na Pi (skrypt idzie przez stdin)"""
+    return f"python3 - {int(port)} {app_dir} {int(log_lines)} <<'DAWID_COLLECTOR'\n{REMOTE_COLLECTOR}\nDAWID_COLLECTOR"
+
+
+class SshChannel:
+    """Jedno trwałe połączenie SSH do celu - zdalna powłoka, przez którą idą wszystkie komendy.
+
+    Handshake odbywa się raz. Każda komenda działa w podpowłoce, a jej koniec i kod
+    wyjścia oznacza unikalny znacznik na stdout i stderr. Martwe albo zawieszone
+    połączenie jest zamykane i przy następnej komendzie nawiązywane od nowa.
+    """
+
+    def __init__(self, target, is_windows):
+        self.target = target
+        self.is_windows = is_windows
+        self._process = None
+        self._stdout = None
+        self._stderr = None
+        self._lock = threading.Lock()
+
+    @property
+    def alive(self):
+        return self._process is not None and self._process.poll() is None
+
+    def _connect(self):
+        known_hosts = 'nul' if self.is_windows else '/dev/null'
+        options = [arg for option in SSH_OPTIONS + [f'UserKnownHostsFile={known_hosts}'] for arg in ('-o', option)]
+        self._process = subprocess.Popen(
+            ['ssh', *options, '-T', self.target, 'sh'],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            text=True, encoding='utf-8', errors='replace', bufsize=1,
+            creationflags=subprocess.CREATE_NO_WINDOW if self.is_windows else 0,
+        )
+        self._stdout, self._stderr = queue.Queue(), queue.Queue()
+        for stream, lines in ((self._process.stdout, self._stdout), (self._process.stderr, self._stderr)):
+            threading.Thread(target=self._pump, args=(stream, lines), daemon=True).start()
+
+    @staticmethod
+    def _pump(stream, lines):
+        for line in stream:
+            lines.put(line)
+        lines.put(None)  # EOF - połączenie zamknięte
+
+    @staticmethod
+    def _read_until(lines, marker, deadline):
+        collected = []
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError
+            try:
+                line = lines.get(timeout=remaining)
+            except queue.Empty:
+                raise TimeoutError
+            if line is None:
+                raise ConnectionError(''.join(collected))
+            # Wyjście bez końcowego znaku nowej linii skleja się ze znacznikiem
+            position = line.find(marker)
+            if position >= 0:
+                collected.append(line[:position])
+                return ''.join(collected), line[position + len(marker):].strip()
+            collected.append(line)
+
+    def _drain_stderr(self):
+        lines = []
+        while True:
+            try:
+                line = self._stderr.get(timeout=0.5)
+            except queue.Empty:
+                break
+            if line is None:
+                break
+            lines.append(line)
+        return ''.join(lines)
+
+    def run(self, command, timeout=20):
+        """Zwraca (stdout, stderr, kod wyjścia), jak subprocess.run"""
+        with self._lock:
+            for attempt in (1, 2):
+                if not self.alive:
+                    try:
+                        self._connect()
+                    except OSError as e:
+                        # Np. brak programu ssh (Windows bez OpenSSH, minimalny host crona)
+                        return "", f"Błąd wykonania: {e}", 255
+                marker = f"__DAWID_{uuid.uuid4().hex}__"
+                deadline = time.monotonic() + timeout
+                try:
+                    # </dev/null: komenda nie może zjeść z stdin kolejnych poleceń
+                    self._process.stdin.write(
+                        f'( {command}\n) </dev/null; echo "{marker} $?"; echo {marker} >&2\n')
+                    self._process.stdin.flush()
+                    stdout, code = self._read_until(self._stdout, marker, deadline)
+                    stderr, _ = self._read_until(self._stderr, marker, deadline)
+                    return stdout, stderr, int(code or 0)
+                except TimeoutError:
+                    self.close()
+                    return "", f"Timeout po {timeout} sekundach - sesja SSH mogła się zawiesić", 1
+                except (ConnectionError, OSError):
+                    # Zerwane połączenie (np. restart Pi) - jedna próba ponownego połączenia
+                    error = self._drain_stderr()
+                    self.close()
+                    if attempt == 2:
+                        return "", error or "Połączenie SSH zostało zerwane", 255
+
+    def close(self):
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+            process.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+            process.wait()
+
+
+def load_config(config_file=CONFIG_FILE):
+    """Konfiguracja z pliku uzupełniona wartościami domyślnymi"""
+    config = DEFAULT_CONFIG.copy()
+    if config_file.exists():
+        try:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                config.update(json.load(f))
+        except Exception as e:
+            print(f"Błąd ładowania konfiguracji: {e}")
+    return config
+
+
+def save_config(config, config_file=CONFIG_FILE):
+    try:
+        with open(config_file, 'w', encoding='utf-8') as f:
+            json.dump(config, f, indent=2, ensure_ascii=False)
+    except Exception as e:
+        print(f"Błąd zapisywania konfiguracji: {e}")
+
+
+def ssh_target(config, ip=None):
+    """Alias SSH albo user@ip, zależnie od konfiguracji; None, gdy nie ma adresu"""
+    if config["use_ssh_alias"]:
+        return config["ssh_alias"]
+    ip = ip or config.get("last_working_ip")
+    return f"{config['ssh_user']}@{ip}" if ip else None
+
+
+# Stany zdrowia i kody wyjścia w konwencji wtyczek Nagiosa
+STATUS_EXIT_CODES = {"ok": 0, "warning": 1, "critical": 2, "unknown": 3}
+STATUS_ORDER = ["ok", "unknown", "warning", "critical"]
+
+
+def worst_status(*statuses):
+    return max(statuses, key=STATUS_ORDER.index, default="ok")
+
+
+def probe_all(ips, port, timeout=PROBE_TIMEOUT):
+    """Wyniki sond dla wszystkich adresów (równolegle): {ip: {"ok", "detail"}}"""
+    if not ips:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(ips), thread_name_prefix="probe") as executor:
+        results = executor.map(lambda ip: probe_endpoint(ip, port, timeout), ips)
+        return {ip: {"ok": ok, "detail": detail} for ip, (ok, detail) in zip(ips, results)}
+
+
+def snapshot_problems(snapshot):
+    """Problemy widoczne w migawce stanu Pi: lista {"status", "message"}"""
+    problems = []
+    if not snapshot.get("listening"):
+        problems.append({"status": "critical", "message": "port aplikacji nie nasłuchuje"})
+
+    memory = snapshot.get("memory", {})
+    if "total_mb" in memory and memory["available_mb"] < memory["total_mb"] * MEMORY_AVAILABLE_WARNING:
+        problems.append({"status": "warning", "message": f"mało wolnej pamięci: {memory['available_mb']} MB"})
+
+    disk = snapshot.get("disk", {})
+    if disk.get("used_percent") is not None and disk["used_percent"] > DISK_USED_WARNING:
+        problems.append({"status": "warning", "message": f"dysk zajęty w {disk['used_percent']}%"})
+
+    for section in ("processes", "listening", "memory", "cpu", "disk"):
+        if isinstance(snapshot.get(section), dict) and "error" in snapshot[section]:
+            problems.append({"status": "unknown", "message": f"{section}: {snapshot[section]['error']}"})
+    return problems
+
+
+def run_health_check(config, ips=None, ssh=False, timeout=PROBE_TIMEOUT, log_lines=10):
+    """Pełne sprawdzenie do crona/watchdoga: sondy HTTP i opcjonalnie migawka przez SSH.
+
+    Zwraca raport z polem "status" (ok / warning / critical / unknown) - patrz STATUS_EXIT_CODES.
+    """
+    port = config["port"]
+    ips = list(ips or config["ip_addresses"])
+    probes = probe_all(ips, port, timeout)
+    healthy = [ip for ip in ips if probes[ip]["ok"]]
+    report = {
+        "time": time.time(),
+        "port": port,
+        "probes": probes,
+        "healthy_ip": healthy[0] if healthy else None,
+        "problems": [] if healthy else [{"status": "critical", "message": "żaden adres nie odpowiada na /health"}],
+    }
+
+    if ssh:
+        target = ssh_target(config, report["healthy_ip"])
+        if target is None:
+            report["problems"].append({"status": "unknown", "message": "brak celu SSH"})
+        else:
+            channel = SshChannel(target, IS_WINDOWS)
+            try:
+                stdout, stderr, code = channel.run(remote_snapshot_command(port, log_lines=log_lines))
+            finally:
+                channel.close()
+            try:
+                report["system"] = json.loads(stdout)
+            except ValueError:
+                message = stderr.strip() or f"kod wyjścia {code}"
+                report["problems"].append({"status": "unknown", "message": f"migawka SSH nieudana: {message}"})
+            else:
+                report["problems"] += snapshot_problems(report["system"])
+
+    report["status"] = worst_status(*(problem["status"] for problem in report["problems"]))
+    return report
+
+
+def load_test_status(report):
+    """Stan zdrowia po teście obciążenia: wszystkie zapytania nieudane to awaria"""
+    if not report["requests"] or report["errors"] == report["requests"]:
+        return "critical"
+    return "warning" if report["errors"] else "ok"
@@ -0,0 +1,701 @@
+"""
+Okno diagnostyki Dawida (Tkinter)
+=================================
+Okno Tkinter uruchamiane przez `python diagnostyka.py`; same sprawdzenia są
+w diagnostyka_core. Jak to działa, także w Windows:
+- Komendy zdalne idą przez trwałe połączenie SSH (SshChannel: `ssh -T <cel> sh`),
+  nawiązywane raz na cel; PowerShell służy tylko do komend lokalnych w Windows
+- Timeout komendy zamyka zawieszone połączenie, następna nawiązuje je od nowa
+- Kompatybilność z kluczami SSH w Windows (bez pytań o hosta, known_hosts w nul)
+- Wątki robocze nie dotykają Tk: ustawienia dostają jako migawkę, wyniki oddają przez kolejkę
+"""
+
+import atexit
+import json
+import platform
+import queue
+import subprocess
+import threading
+import tkinter as tk
+from datetime import datetime
+from tkinter import ttk, scrolledtext
+
+import requests
+
+from diagnostyka_core import (
+    CONFIG_FILE, DISK_USED_WARNING, IS_WINDOWS, MEMORY_AVAILABLE_WARNING,
+    SshChannel, find_first_healthy, load_config, remote_snapshot_command, run_load_test, save_config,
+)
+
+# Kolory poziomów w oknie wyników
+LOG_COLORS = {
+    "INFO": "black",
+    "SUCCESS": "green",
+    "WARNING": "orange",
+    "ERROR": "red",
+    "ANALYSIS": "blue"
+}
+LOG_MAX_LINES = 5000  # starsze linie są usuwane z okna wyników
+LOG_BATCH_SIZE = 500  # najwięcej wpisów z kolejki na jedno odświeżenie
+LOG_PUMP_INTERVAL_MS = 100
+
+
+class DawidDiagnostics:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Dawid AI - Diagnostyka Backend (Multi-IP)")
+        self.root.geometry("900x700")
+
+        # Ścieżka do pliku konfiguracji
+        self.config_file = CONFIG_FILE
+
+        # Załaduj konfigurację
+        self.config = self.load_config()
+
+        # Aktualnie używane IP
+        self.current_working_ip = None
+
+        # Sprawdź system operacyjny
+        self.is_windows = IS_WINDOWS
+
+        # Trwałe połączenia SSH, po jednym na cel
+        self.ssh_channels = {}
+        self.ssh_channels_lock = threading.Lock()
+        atexit.register(self.close_ssh_channels)
+
+        # Wątki diagnostyki nie dotykają Tk: logi i zmiany GUI idą przez kolejkę,
+        # którą opróżnia pętla główna
+        self.ui_queue = queue.Queue()
+
+        self.setup_gui()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def load_config(self):
+        """Załaduj konfigurację z pliku"""
+        return load_config(self.config_file)
+
+    def save_config(self):
+        """Zapisz konfigurację do pliku"""
+        save_config(self.config, self.config_file)
+
+    def setup_gui(self):
+        # Main frame
+        main_frame = ttk.Frame(self.root, padding="10")
+        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        # Konfiguracja Multi-IP
+        config_frame = ttk.LabelFrame(main_frame, text="Konfiguracja Multi-IP", padding="5")
+        config_frame.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
+
+        # IP Addresses
+        ttk.Label(config_frame, text="Adresy IP (sprawdzane równolegle):").grid(row=0, column=0, sticky=tk.W,
+                                                                              columnspan=4)
+
+        self.ip_vars = []
+        for i in range(4):
+            ttk.Label(config_frame, text=f"IP {i + 1}:").grid(row=1 + i // 2, column=(i % 2) * 2, sticky=tk.W,
+                                                              padx=(0, 5))
+            var = tk.StringVar(value=self.config["ip_addresses"][i] if i < len(self.config["ip_addresses"]) else "")
+            entry = ttk.Entry(config_frame, textvariable=var, width=15)
+            entry.grid(row=1 + i // 2, column=(i % 2) * 2 + 1, padx=(0, 20), pady=2)
+            self.ip_vars.append(var)
+
+        # Port i SSH config
+        ttk.Label(config_frame, text="Port:").grid(row=3, column=0, sticky=tk.W)
+        self.port_var = tk.StringVar(value=str(self.config["port"]))
+        ttk.Entry(config_frame, textvariable=self.port_var, width=8).grid(row=3, column=1, sticky=tk.W, padx=(0, 20))
+
+        # SSH Configuration
+        ssh_frame = ttk.LabelFrame(config_frame, text="SSH Config", padding="3")
+        ssh_frame.grid(row=4, column=0, columnspan=4, sticky=(tk.W, tk.E), pady=(10, 0))
+
+        self.use_alias_var = tk.BooleanVar(value=self.config["use_ssh_alias"])
+        ttk.Checkbutton(ssh_frame, text="Użyj aliasu SSH", variable=self.use_alias_var,
+                        command=self.toggle_ssh_mode).grid(row=0, column=0, sticky=tk.W)
+
+        ttk.Label(ssh_frame, text="Alias:").grid(row=0, column=1, sticky=tk.W, padx=(20, 5))
+        self.ssh_alias_var = tk.StringVar(value=self.config["ssh_alias"])
+        self.alias_entry = ttk.Entry(ssh_frame, textvariable=self.ssh_alias_var, width=10)
+        self.alias_entry.grid(row=0, column=2, padx=(0, 20))
+
+        ttk.Label(ssh_frame, text="User@IP:").grid(row=0, column=3, sticky=tk.W, padx=(0, 5))
+        self.ssh_user_var = tk.StringVar(value=self.config["ssh_user"])
+        self.user_entry = ttk.Entry(ssh_frame, textvariable=self.ssh_user_var, width=10)
+        self.user_entry.grid(row=0, column=4)
+
+        self.toggle_ssh_mode()  # Ustaw początkowy stan
+
+        # Test obciążenia
+        load_frame = ttk.LabelFrame(config_frame, text="Test obciążenia", padding="3")
+        load_frame.grid(row=5, column=0, columnspan=4, sticky=(tk.W, tk.E), pady=(10, 0))
+
+        ttk.Label(load_frame, text="Wątki:").grid(row=0, column=0, sticky=tk.W, padx=(0, 5))
+        self.load_concurrency_var = tk.StringVar(value=str(self.config["load_test_concurrency"]))
+        ttk.Entry(load_frame, textvariable=self.load_concurrency_var, width=6).grid(row=0, column=1, padx=(0, 20))
+
+        ttk.Label(load_frame, text="Czas [s]:").grid(row=0, column=2, sticky=tk.W, padx=(0, 5))
+        self.load_duration_var = tk.StringVar(value=str(self.config["load_test_duration"]))
+        ttk.Entry(load_frame, textvariable=self.load_duration_var, width=6).grid(row=0, column=3)
+
+        # Przycisk zapisz config
+        ttk.Button(config_frame, text="💾 Zapisz Konfigurację",
+                   command=self.save_current_config).grid(row=6, column=0, columnspan=4, pady=(10, 0))
+
+        # Status aktualnego IP
+        self.current_ip_var = tk.StringVar(value="Brak aktywnego IP")
+        ttk.Label(main_frame, textvariable=self.current_ip_var, font=('TkDefaultFont', 10, 'bold')).grid(
+            row=1, column=0, columnspan=2, pady=(0, 10))
+
+        # Przyciski diagnostyki
+        buttons_frame = ttk.Frame(main_frame)
+        buttons_frame.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
+
+        ttk.Button(buttons_frame, text="🔍 Pełna Diagnostyka",
+                   command=self.run_full_diagnostics, style="Accent.TButton").pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(buttons_frame, text="🌐 Znajdź Działające IP",
+                   command=self.find_working_ip).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(buttons_frame, text="📊 Stan Systemu",
+                   command=self.check_system_status).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(buttons_frame, text="🔧 Test SSH",
+                   command=self.test_ssh_connection).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(buttons_frame, text="🔥 Test Obciążenia",
+                   command=self.run_load_test).pack(side=tk.LEFT, padx=(0, 10))
+        # Dodaj nowy przycisk do czyszczenia SSH
+        ttk.Button(buttons_frame, text="🚨 Kill SSH",
+                   command=self.kill_ssh_sessions).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(buttons_frame, text="🔄 Wyczyść",
+                   command=self.clear_output).pack(side=tk.RIGHT)
+
+        # Status bar
+        self.status_var = tk.StringVar(value="Gotowy do diagnostyki")
+        status_frame = ttk.Frame(main_frame)
+        status_frame.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
+
+        self.status_label = ttk.Label(status_frame, textvariable=self.status_var)
+        self.status_label.pack(side=tk.LEFT)
+
+        self.progress = ttk.Progressbar(status_frame, mode='indeterminate')
+        self.progress.pack(side=tk.RIGHT, padx=(10, 0))
+
+        # Wyniki
+        results_frame = ttk.LabelFrame(main_frame, text="Wyniki Diagnostyki", padding="5")
+        results_frame.grid(row=4, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        self.output_text = scrolledtext.ScrolledText(results_frame, wrap=tk.WORD, width=90, height=25)
+        self.output_text.pack(fill=tk.BOTH, expand=True)
+        for level, color in LOG_COLORS.items():
+            self.output_text.tag_config(level, foreground=color)
+        self.root.after(LOG_PUMP_INTERVAL_MS, self._pump_ui_queue)
+
+        # Konfiguracja grid weights
+        self.root.columnconfigure(0, weight=1)
+        self.root.rowconfigure(0, weight=1)
+        main_frame.columnconfigure(0, weight=1)
+        main_frame.rowconfigure(4, weight=1)
+
+        # Sprawdź ostatnie działające IP przy starcie
+        if self.config["last_working_ip"]:
+            self.current_working_ip = self.config["last_working_ip"]
+            self.update_current_ip_display()
+
+    def toggle_ssh_mode(self):
+        """Przełącz między trybem aliasu a user@ip"""
+        if self.use_alias_var.get():
+            self.alias_entry.configure(state='normal')
+            self.user_entry.configure(state='disabled')
+        else:
+            self.alias_entry.configure(state='disabled')
+            self.user_entry.configure(state='normal')
+
+    def read_settings(self):
+        """Migawka ustawień z pól GUI (klucze jak w konfiguracji); tylko z wątku Tk.
+
+        Wątki robocze dostają ją jako argument - zmienne Tk wolno czytać tylko z wątku,
+        w którym działa pętla zdarzeń. Niepoprawne liczby zostają z konfiguracji.
+        """
+        def number(var, key):
+            return int(var.get()) if var.get().isdigit() else self.config[key]
+
+        return {
+            "ip_addresses": self.get_active_ips(),
+            "port": number(self.port_var, "port"),
+            "ssh_alias": self.ssh_alias_var.get(),
+            "ssh_user": self.ssh_user_var.get(),
+            "use_ssh_alias": self.use_alias_var.get(),
+            "load_test_concurrency": number(self.load_concurrency_var, "load_test_concurrency"),
+            "load_test_duration": number(self.load_duration_var, "load_test_duration"),
+        }
+
+    def save_current_config(self):
+        """Zapisz aktualną konfigurację z GUI"""
+        self.config.update(self.read_settings())
+        self.save_config()
+        self.log("💾 Konfiguracja została zapisana", "SUCCESS")
+
+    def update_current_ip_display(self):
+        """Aktualizuj wyświetlanie aktualnego IP"""
+        self._call_in_ui(self._show_current_ip)
+
+    def _show_current_ip(self):
+        if self.current_working_ip:
+            self.current_ip_var.set(f"🟢 Aktywne IP: {self.current_working_ip}")
+        else:
+            self.current_ip_var.set("🔴 Brak aktywnego IP")
+
+    def get_active_ips(self):
+        """Pobierz listę aktywnych IP z GUI (tylko z wątku Tk)"""
+        return [ip.get().strip() for ip in self.ip_vars if ip.get().strip()]
+
+    def log(self, message, level="INFO"):
+        """Dodaje linię do wyników; można wołać z dowolnego wątku"""
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        self.ui_queue.put(("log", f"[{timestamp}] {message}\n", level))
+
+    def set_status(self, message, progress=False):
+        self._call_in_ui(self._show_status, message, progress)
+
+    def _show_status(self, message, progress):
+        self.status_var.set(message)
+        if progress:
+            self.progress.start()
+        else:
+            self.progress.stop()
+
+    def _call_in_ui(self, function, *args):
+        """Wykonuje funkcję w wątku Tk, w kolejności względem logów"""
+        self.ui_queue.put(("call", function, args))
+
+    def _pump_ui_queue(self):
+        """Przenosi paczkę wpisów z kolejki do okna, po czym planuje kolejne odświeżenie"""
+        lines = []
+        handled = 0
+        try:
+            while handled < LOG_BATCH_SIZE:
+                kind, *payload = self.ui_queue.get_nowait()
+                handled += 1
+                if kind == "log":
+                    lines.extend(payload)
+                else:
+                    self._append_lines(lines)
+                    lines = []
+                    function, args = payload
+                    function(*args)
+        except queue.Empty:
+            pass
+        self._append_lines(lines)
+        # Przy zaległościach w kolejce następna paczka od razu, bez czekania
+        delay = 1 if handled == LOG_BATCH_SIZE else LOG_PUMP_INTERVAL_MS
+        self.root.after(delay, self._pump_ui_queue)
+
+    def _append_lines(self, lines):
+        """lines to naprzemiennie tekst i poziom - jedno wstawienie na całą paczkę"""
+        if not lines:
+            return
+        self.output_text.insert(tk.END, *lines)
+        line_count = int(self.output_text.index("end-1c").split(".")[0]) - 1
+        if line_count > LOG_MAX_LINES:
+            self.output_text.delete("1.0", f"{line_count - LOG_MAX_LINES + 1}.0")
+        self.output_text.see(tk.END)
+
+    def run_command_ssh(self, command, settings, target_ip=None, timeout=20):
+        """Uruchom komendę przez trwałe połączenie SSH do celu (nawiązywane przy pierwszym użyciu)"""
+        if settings["use_ssh_alias"]:
+            # Użyj aliasu SSH
+            ssh_target = settings["ssh_alias"]
+        else:
+            # Użyj user@ip
+            ip = target_ip or self.current_working_ip
+            if not ip:
+                return "", "Brak dostępnego IP", 1
+            ssh_target = f"{settings['ssh_user']}@{ip}"
+
+        with self.ssh_channels_lock:
+            channel = self.ssh_channels.get(ssh_target)
+            if channel is None:
+                channel = self.ssh_channels[ssh_target] = SshChannel(ssh_target, self.is_windows)
+
+        reused = "" if not channel.alive else ", istniejące połączenie"
+        self.log(f"🔐 SSH: {ssh_target} (timeout: {timeout}s{reused})", "INFO")
+        return channel.run(command, timeout)
+
+    def close_ssh_channels(self):
+        """Zamyka wszystkie trwałe połączenia SSH"""
+        with self.ssh_channels_lock:
+            channels, self.ssh_channels = list(self.ssh_channels.values()), {}
+        for channel in channels:
+            channel.close()
+
+    def on_close(self):
+        self.close_ssh_channels()
+        self.root.destroy()
+
+    def run_command_local_with_timeout(self, command, timeout=20):
+        """Uruchom komendę lokalnie z agresywnym timeoutem"""
+        try:
+            if self.is_windows:
+                # W Windows używamy PowerShell z timeoutem
+                powershell_command = f"""
+                $job = Start-Job -ScriptBlock {{ {command} }}
+                if (Wait-Job $job -Timeout {timeout}) {{
+                    Receive-Job $job
+                    Remove-Job $job
+                }} else {{
+                    Stop-Job $job
+                    Remove-Job $job
+                    throw "Command timed out after {timeout} seconds"
+                }}
+                """
+                result = subprocess.run(
+                    ['powershell', '-Command', powershell_command],
+                    capture_output=True, text=True, timeout=timeout + 5,
+                    encoding='utf-8', errors='replace'
+                )
+            else:
+                # Linux/Mac
+                result = subprocess.run(
+                    command, shell=True, capture_output=True,
+                    text=True, timeout=timeout
+                )
+            return result.stdout, result.stderr, result.returncode
+        except subprocess.TimeoutExpired:
+            return "", f"Timeout po {timeout} sekundach - sesja SSH mogła się zawiesić", 1
+        except Exception as e:
+            return "", f"Błąd wykonania: {str(e)}", 1
+
+    def find_working_ip(self):
+        """Znajdź pierwsze działające IP"""
+        self.set_status("Szukanie działającego IP...", True)
+        threading.Thread(target=self._find_working_ip_thread, args=(self.read_settings(),), daemon=True).start()
+
+    def _find_working_ip_thread(self, settings):
+        self.log("🔍 === SZUKANIE DZIAŁAJĄCEGO IP ===", "INFO")
+
+        ips = settings["ip_addresses"]
+        port = settings["port"]
+        self.log(f"🔍 Sprawdzam równolegle: {', '.join(ips)}", "INFO")
+
+        ip = find_first_healthy(ips, port, log=self.log)
+        if ip:
+            self.current_working_ip = ip
+            if ip != self.config.get("last_working_ip"):
+                self.config["last_working_ip"] = ip
+                self.save_config()
+            self.update_current_ip_display()
+            self.log(f"✅ Znaleziono działające IP: {ip}", "SUCCESS")
+            self.set_status("Znaleziono działające IP")
+            return
+
+        self.log("❌ Nie znaleziono żadnego działającego IP!", "ERROR")
+        self.current_working_ip = None
+        self.update_current_ip_display()
+        self.set_status("Nie znaleziono działającego IP")
+
+    def kill_ssh_sessions(self):
+        """Zabij zawieszone sesje SSH"""
+        self.set_status("Czyszczenie sesji SSH...", True)
+        threading.Thread(target=self._kill_ssh_thread, daemon=True).start()
+
+    def _kill_ssh_thread(self):
+        self.log("🚨 === CZYSZCZENIE SESJI SSH ===", "INFO")
+
+        self.close_ssh_channels()
+        self.log("🔌 Zamknięto połączenia SSH diagnostyki", "INFO")
+
+        if self.is_windows:
+            # Windows - zabij procesy SSH
+            self.log("🔍 Szukam procesów SSH w Windows...", "INFO")
+            stdout, stderr, code = self.run_command_local_with_timeout(
+                "Get-Process ssh -ErrorAction SilentlyContinue | ForEach-Object { Stop-Process -Id $_.Id -Force; Write-Host \"Killed SSH process $($_.Id)\" }",
+                timeout=10
+            )
+
+            if code == 0:
+                if stdout.strip():
+                    self.log("✅ Zabito procesy SSH:", "SUCCESS")
+                    for line in stdout.strip().split('\n'):
+                        if line.strip():
+                            self.log(f"  • {line}", "INFO")
+                else:
+                    self.log("ℹ️ Brak aktywnych procesów SSH", "INFO")
+            else:
+                self.log("⚠️ Nie udało się sprawdzić procesów SSH", "WARNING")
+
+            # Dodatkowo - wyczyść connection sharing
+            self.log("🧹 Czyszczenie connection sharing...", "INFO")
+            stdout, stderr, code = self.run_command_local_with_timeout(
+                "Remove-Item $env:TEMP\\ssh-* -Recurse -Force -ErrorAction SilentlyContinue",
+                timeout=5
+            )
+
+        else:
+            # Linux/Mac
+            self.log("🔍 Szukam procesów SSH w Linux/Mac...", "INFO")
+            stdout, stderr, code = self.run_command_local_with_timeout("pkill -f 'ssh.*frpi'", timeout=10)
+
+        self.log("✅ Czyszczenie sesji SSH zakończone", "SUCCESS")
+        self.log("💡 Teraz możesz spróbować ponownie test SSH", "ANALYSIS")
+        self.set_status("Czyszczenie SSH zakończone")
+
+    def test_ssh_connection(self):
+        """Test połączenia SSH"""
+        self.set_status("Testowanie SSH...", True)
+        threading.Thread(target=self._test_ssh_thread, args=(self.read_settings(),), daemon=True).start()
+
+    def _test_ssh_thread(self, settings):
+        self.log("🔐 === TEST POŁĄCZENIA SSH ===", "INFO")
+
+        if settings["use_ssh_alias"]:
+            self.log(f"🎯 Testuję alias SSH: {settings['ssh_alias']}", "INFO")
+        else:
+            target_ip = self.current_working_ip or (settings["ip_addresses"] or ["brak"])[0]
+            self.log(f"🎯 Testuję SSH: {settings['ssh_user']}@{target_ip}", "INFO")
+
+        # Test 1: Szybki test połączenia
+        self.log("1️⃣ Szybki test połączenia SSH...", "INFO")
+        stdout, stderr, code = self.run_command_ssh("echo 'SSH OK'", settings, timeout=15)
+
+        if code == 0 and "SSH OK" in stdout:
+            self.log("✅ SSH: Podstawowe połączenie działa!", "SUCCESS")
+
+            # Test 2: Informacje o systemie
+            self.log("2️⃣ Sprawdzam system...", "INFO")
+            stdout, stderr, code = self.run_command_ssh("pwd && whoami && uname -a", settings, timeout=10)
+            if code == 0:
+                lines = stdout.strip().split('\n')
+                self.log(f"📁 Katalog: {lines[0] if lines else 'unknown'}", "INFO")
+                self.log(f"👤 Użytkownik: {lines[1] if len(lines) > 1 else 'unknown'}", "INFO")
+                self.log(f"💻 System: {lines[2] if len(lines) > 2 else 'unknown'}", "INFO")
+
+            # Test 3: Dostęp do aplikacji
+            self.log("3️⃣ Sprawdzam dostęp do aplikacji...", "INFO")
+            stdout, stderr, code = self.run_command_ssh("ls -la ~/dawid-app/ | head -5", settings, timeout=10)
+            if code == 0 and "app.py" in stdout:
+                self.log("✅ Dostęp do ~/dawid-app/: OK", "SUCCESS")
+
+                # Sprawdź czy aplikacja działa
+                stdout, stderr, code = self.run_command_ssh("ps aux | grep 'app.py' | grep -v grep", settings,
+                                                            timeout=10)
+                if stdout.strip():
+                    self.log("✅ Aplikacja Dawida: DZIAŁA", "SUCCESS")
+                else:
+                    self.log("⚠️ Aplikacja Dawida: NIE DZIAŁA", "WARNING")
+                    self.log("🔧 Rozwiązanie: cd ~/dawid-app && python app.py", "ANALYSIS")
+            else:
+                self.log("⚠️ Brak dostępu do ~/dawid-app/ lub brak app.py", "WARNING")
+
+        else:
+            self.log("❌ SSH: Połączenie nie działa!", "ERROR")
+            if stderr:
+                if "timeout" in stderr.lower():
+                    self.log("🕒 Problem: Timeout - SSH się zawiesza", "ERROR")
+                    self.log("🔧 ROZWIĄZANIA:", "ANALYSIS")
+                    self.log("1. Sprawdź czy RPi działa: ping 192.168.1.144", "ANALYSIS")
+                    self.log("2. Restartuj SSH: ssh frpi 'sudo systemctl restart ssh'", "ANALYSIS")
+                    self.log("3. Sprawdź konfigurację SSH w ~/.ssh/config", "ANALYSIS")
+                else:
+                    self.log(f"Błąd: {stderr}", "ERROR")
+                    self.log("🔧 ROZWIĄZANIA:", "ANALYSIS")
+                    self.log("1. Sprawdź klucze SSH: ssh-add -l", "ANALYSIS")
+                    self.log("2. Test manualny: ssh frpi", "ANALYSIS")
+                    self.log("3. Sprawdź konfigurację ~/.ssh/config", "ANALYSIS")
+
+        self.set_status("Test SSH zakończony")
+
+    def check_system_status(self):
+        if not self.current_working_ip:
+            self.log("❌ Brak aktywnego IP! Najpierw znajdź działające IP.", "ERROR")
+            return
+
+        self.set_status("Sprawdzanie stanu systemu...", True)
+        threading.Thread(target=self._check_system_thread, args=(self.read_settings(),), daemon=True).start()
+
+    def _check_system_thread(self, settings):
+        self.log(f"=== STAN SYSTEMU {self.current_working_ip} ===", "INFO")
+
+        port = settings["port"]
+        self.log("📡 Pobieram migawkę stanu systemu...")
+        stdout, stderr, code = self.run_command_ssh(remote_snapshot_command(port), settings)
+        try:
+            snapshot = json.loads(stdout)
+        except ValueError:
+            self.log(f"❌ Nie udało się pobrać stanu systemu (kod {code})", "ERROR")
+            if stderr.strip():
+                self.log(f"  {stderr.strip()}", "ERROR")
+            self.set_status("Sprawdzanie systemu nieudane")
+            return
+
+        self._render_system_snapshot(snapshot, port)
+        self.set_status("Sprawdzanie systemu zakończone")
+
+    def _render_system_snapshot(self, snapshot, port):
+        # Procesy Python
+        processes = snapshot.get("processes")
+        if isinstance(processes, list) and processes:
+            self.log("✅ Znalezione procesy Python:", "SUCCESS")
+            for process in processes:
+                line = f"PID {process['pid']} ({process['rss_mb']} MB): {process['cmdline']}"
+                if process["dawid"]:
+                    self.log(f"  🎯 DAWID APP: {line}", "SUCCESS")
+                else:
+                    self.log(f"  • {line}", "INFO")
+        else:
+            self.log("❌ Brak procesów Python!", "ERROR")
+            self.log("🔧 ROZWIĄZANIE: cd ~/dawid-app && source venv/bin/activate && python app.py", "ANALYSIS")
+
+        # Port
+        listening = snapshot.get("listening")
+        if isinstance(listening, list) and listening:
+            owners = ", ".join(str(socket_info["pid"]) for socket_info in listening if socket_info["pid"])
+            self.log(f"✅ Port {port} nasłuchuje" + (f" (PID {owners})" if owners else ""), "SUCCESS")
+        else:
+            self.log(f"❌ Port {port} nie jest używany", "ERROR")
+
+        # Pamięć RAM
+        memory = snapshot.get("memory", {})
+        if "total_mb" in memory:
+            used = memory["total_mb"] - memory["available_mb"]
+            self.log(f"📊 RAM: używane {used} MB z {memory['total_mb']} MB, dostępne {memory['available_mb']} MB",
+                     "INFO")
+            if memory["swap_total_mb"]:
+                self.log(f"  Swap: zajęte {memory['swap_total_mb'] - memory['swap_free_mb']} MB "
+                         f"z {memory['swap_total_mb']} MB", "INFO")
+            if memory["available_mb"] < memory["total_mb"] * MEMORY_AVAILABLE_WARNING:
+                self.log("⚠️ OSTRZEŻENIE: Wysokie użycie pamięci RAM!", "WARNING")
+                self.log("🔧 ROZWIĄZANIE: sudo reboot", "ANALYSIS")
+            else:
+                self.log("✅ Użycie pamięci RAM: OK", "SUCCESS")
+
+        # Procesor
+        cpu = snapshot.get("cpu", {})
+        if "usage_percent" in cpu:
+            load = " / ".join(f"{value:.2f}" for value in cpu["load"])
+            temperature = f", temperatura {cpu['temperature_c']:.1f}°C" if "temperature_c" in cpu else ""
+            self.log(f"🧮 CPU: {cpu['usage_percent']}% ({cpu['count']} rdz.), obciążenie {load}{temperature}", "INFO")
+
+        # Dysk
+        disk = snapshot.get("disk", {})
+        if disk.get("used_percent") is not None:
+            level = "WARNING" if disk["used_percent"] > DISK_USED_WARNING else "INFO"
+            self.log(f"💽 Dysk: zajęte {disk['used_percent']}%, wolne {disk['free_mb']} MB", level)
+
+        # Logi aplikacji
+        log_tail = snapshot.get("log_tail")
+        if isinstance(log_tail, list) and log_tail:
+            self.log(f"📋 Ostatnie {len(log_tail)} linii z dawid.log:", "INFO")
+            for line in log_tail:
+                if 'ERROR' in line.upper() or 'EXCEPTION' in line.upper():
+                    self.log(f"  ❌ {line}", "ERROR")
+                else:
+                    self.log(f"  📝 {line}", "INFO")
+        else:
+            self.log("⚠️ Nie można odczytać logów aplikacji", "WARNING")
+
+    def run_full_diagnostics(self):
+        self.set_status("Uruchamianie pełnej diagnostyki...", True)
+        threading.Thread(target=self._full_diagnostics_thread, args=(self.read_settings(),), daemon=True).start()
+
+    def _full_diagnostics_thread(self, settings):
+        self.log("🔍 === PEŁNA DIAGNOSTYKA DAWID AI (MULTI-IP) === 🔍", "INFO")
+        self.log(f"System: {platform.system()} {platform.release()}", "INFO")
+        self.log(f"Czas: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", "INFO")
+        self.log("=" * 60, "INFO")
+
+        # Znajdź działające IP
+        if not self.current_working_ip:
+            self._find_working_ip_thread(settings)
+            self.log("\n" + "=" * 60, "INFO")
+
+        if self.current_working_ip:
+            # Test SSH
+            self._test_ssh_thread(settings)
+            self.log("\n" + "=" * 60, "INFO")
+
+            # Stan systemu
+            self._check_system_thread(settings)
+            self.log("\n" + "=" * 60, "INFO")
+
+            # Test funkcjonalny API
+            self.log("🧪 Test funkcjonalny API...")
+            try:
+                port = settings["port"]
+                test_data = {"message": "test diagnostyczny"}
+                response = requests.post(f"http://{self.current_working_ip}:{port}/chat",
+                                         json=test_data, timeout=15)
+
+                if response.status_code == 200:
+                    self.log("✅ API: Test funkcjonalny przeszedł pomyślnie", "SUCCESS")
+                    resp_data = response.json()
+                    self.log(f"  Odpowiedź: {resp_data.get('response', 'brak odpowiedzi')}", "INFO")
+                else:
+                    self.log(f"❌ API: Test funkcjonalny failed (status: {response.status_code})", "ERROR")
+            except Exception as e:
+                self.log(f"❌ API: Test funkcjonalny error - {e}", "ERROR")
+
+        # Podsumowanie
+        self.log("\n" + "=" * 60, "INFO")
+        self.log("📊 === PODSUMOWANIE DIAGNOSTYKI ===", "ANALYSIS")
+
+        if self.current_working_ip:
+            self.log(f"✅ Działające IP: {self.current_working_ip}", "SUCCESS")
+        else:
+            self.log("❌ Nie znaleziono działającego IP", "ERROR")
+
+        self.log("✅ Diagnostyka zakończona!", "SUCCESS")
+        self.log("💡 Sprawdź wyniki powyżej i zastosuj sugerowane rozwiązania", "ANALYSIS")
+
+        self.set_status("Pełna diagnostyka zakończona")
+
+    def run_load_test(self):
+        if not self.current_working_ip:
+            self.log("❌ Brak aktywnego IP! Najpierw znajdź działające IP.", "ERROR")
+            return
+
+        self.set_status("Test obciążenia...", True)
+        threading.Thread(target=self._load_test_thread, args=(self.read_settings(),), daemon=True).start()
+
+    def _load_test_thread(self, settings):
+        self.log("🔥 === TEST OBCIĄŻENIA ===", "INFO")
+        base_url = f"http://{self.current_working_ip}:{settings['port']}"
+
+        report = run_load_test(base_url, settings["load_test_concurrency"], settings["load_test_duration"],
+                               log=self.log)
+
+        self.log(f"📊 {report['requests']} zapytań, {report['rps']} zapytań/s", "ANALYSIS")
+        level = "SUCCESS" if report["error_rate"] < 0.01 else "ERROR"
+        self.log(f"{'✅' if level == 'SUCCESS' else '❌'} Błędy: {report['errors']} "
+                 f"({report['error_rate']:.1%})", level)
+        for endpoint, stats in report["endpoints"].items():
+            if stats["requests"]:
+                self.log(f"  {endpoint}: {stats['requests']} zapytań, p50 {stats['p50_ms']:.1f} ms, "
+                         f"p95 {stats['p95_ms']:.1f} ms, p99 {stats['p99_ms']:.1f} ms", "INFO")
+        if report["latency"]["p99_ms"] and report["latency"]["p99_ms"] > 1000:
+            self.log("⚠️ p99 powyżej 1 s - serwer nie nadąża przy tym obciążeniu", "WARNING")
+
+        self.set_status("Test obciążenia zakończony")
+
+    def clear_output(self):
+        self.output_text.delete(1.0, tk.END)
+        self.set_status("Gotowy do diagnostyki")
+
+
+def run_gui():
+    root = tk.Tk()
+
+    # Style
+    style = ttk.Style()
+    style.theme_use('clam')
+
+    app = DawidDiagnostics(root)
+
+    # Instrukcja przy starcie
+    app.log("Diagnostyka Dawida", "SUCCESS")
+    app.log("🚀 QUICK START:")
+    app.log("1. Jeśli SSH się zawiesza - użyj 'Kill SSH'")
+    app.log("2. Sprawdź czy IP są poprawne w konfiguracji")
+    app.log("3. Kliknij 'Test SSH' aby sprawdzić połączenie z frpi")
+    app.log("4. Jeśli SSH działa, użyj 'Znajdź Działające IP'")
+    app.log("5. Na końcu 'Pełna Diagnostyka' dla pełnego przeglądu")
+    app.log("=" * 70)
+
+    root.mainloop()
+
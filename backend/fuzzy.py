@@ -0,0 +1,126 @@
+import heapq
+import math
+from array import array
+from bisect import bisect_left
+from itertools import islice
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+POLISH_DIACRITICS = str.maketrans('ąćęłńóśźżĄĆĘŁŃÓŚŹŻ', 'acelnoszzACELNOSZZ')
+
+
+def fold_diacritics(text: str) -> str:
+    """Zamienia polskie znaki na ich odpowiedniki bez ogonków (żółw -> zolw)"""
+    return text.translate(POLISH_DIACRITICS)
+
+
+def trigrams(question: str) -> FrozenSet[str]:
+    """Trigramy znakowe znormalizowanego pytania, po zdjęciu ogonków"""
+    padded = f"  {fold_diacritics(question)} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def similarity(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Współczynnik Dice'a dla dwóch zbiorów trigramów"""
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+def min_overlap(query_size: int, threshold: float) -> int:
+    """Ile trigramów musi współdzielić kandydat, żeby mógł osiągnąć próg.
+
+    Z Dice >= t oraz c <= |k| wynika c >= t * |q| / (2 - t).
+    """
+    return max(1, math.ceil(threshold * query_size / (2 - threshold) - 1e-9))
+
+
+def size_bounds(query_size: int, threshold: float) -> Tuple[int, int]:
+    """Zakres liczby trigramów kandydata, przy którym Dice >= t jest w ogóle możliwe.
+
+    Z c <= min(|q|, |k|) wynika t * |q| / (2 - t) <= |k| <= (2 - t) * |q| / t.
+    """
+    return (min_overlap(query_size, threshold),
+            math.floor((2 - threshold) * query_size / threshold + 1e-9))
+
+
+def probe_count(query_size: int, threshold: float) -> int:
+    """Z ilu najrzadszych trigramów zapytania zbierać kandydatów.
+
+    Kandydat z wystarczającym pokryciem musi mieć któryś z pierwszych
+    |q| - min_overlap + 1 trigramów (filtr prefiksowy); list jest najwyżej MAX_PROBE_LISTS.
+    """
+    return min(query_size - min_overlap(query_size, threshold) + 1, MAX_PROBE_LISTS)
+
+
+# Ograniczenia jednego wyszukiwania - koszt nie rośnie z rozmiarem bazy. Kandydat spoza
+# przejrzanej części list zostanie pominięty, ale to pytania z samymi częstymi trigramami,
+# a więc i tak słabo pasujące
+MAX_PROBE_LISTS = 8
+MAX_SCANNED_POSTINGS = 10000
+MAX_CANDIDATES = 64
+EMPTY_POSTINGS = array('I')
+
+
+class TrigramIndex:
+    """Odwrócony indeks trigram -> numery pytań, do przybliżonego dopasowania.
+
+    Kandydaci są zbierani z najrzadszych trigramów zapytania (filtr prefiksowy)
+    i odsiewani po liczbie trigramów; przejrzanych wpisów list i sprawdzanych
+    kandydatów jest najwyżej MAX_SCANNED_POSTINGS i MAX_CANDIDATES. Pokrycie
+    liczymy z list (numery są rosnące, więc wystarcza bisekcja), bez ponownego
+    rozbijania kandydatów na trigramy.
+
+    Wszystko jest tylko dopisywane (najpierw pytanie, potem listy), więc czytanie
+    nie wymaga blokady.
+    """
+
+    def __init__(self, questions: Iterable[str] = ()):
+        self._questions: List[str] = []
+        self._sizes = array('I')
+        self._postings: Dict[str, array] = {}
+        for question in questions:
+            self.add(question)
+
+    def add(self, question: str):
+        """Dodaje nowe pytanie - wywołujący pilnuje, żeby nie dodawać go dwa razy"""
+        grams = trigrams(question)
+        question_id = len(self._questions)
+        self._questions.append(question)
+        self._sizes.append(len(grams))
+        for gram in grams:
+            postings = self._postings.get(gram)
+            if postings is None:
+                self._postings[gram] = array('I', (question_id,))
+            else:
+                postings.append(question_id)
+
+    def search(self, question: str, threshold: float) -> Optional[Tuple[str, float]]:
+        """Zwraca najbardziej podobne pytanie i jego podobieństwo, jeśli przekracza próg"""
+        query = trigrams(question)
+        # Trigramy spoza indeksu to puste listy - liczą się do filtra prefiksowego jako najrzadsze
+        postings = sorted((self._postings.get(gram, EMPTY_POSTINGS) for gram in query), key=len)
+        low, high = size_bounds(len(query), threshold)
+        sizes = self._sizes
+
+        hits: Dict[int, int] = {}
+        budget = MAX_SCANNED_POSTINGS
+        for ids in postings[:probe_count(len(query), threshold)]:
+            for question_id in islice(ids, budget):
+                if low <= sizes[question_id] <= high:
+                    hits[question_id] = hits.get(question_id, 0) + 1
+            budget -= len(ids)
+            if budget <= 0:
+                break
+
+        best = None
+        for question_id in heapq.nlargest(MAX_CANDIDATES, hits, key=hits.get):
+            overlap = sum(_contains(ids, question_id) for ids in postings)
+            score = 2 * overlap / (len(query) + sizes[question_id])
+            if score >= threshold and (best is None or score > best[1]):
+                best = (self._questions[question_id], score)
+        return best
+
+
+def _contains(ids: array, question_id: int) -> bool:
+    position = bisect_left(ids, question_id)
+    return position < len(ids) and ids[position] == question_id
@@ -0,0 +1,42 @@
+"""
+Konfiguracja gunicorna z wczytaniem wiedzy przed forkiem
+========================================================
+
+    gunicorn -c gunicorn.conf.py
+
+Proces główny raz wczytuje bazę wiedzy i zamraża obiekty (gc.freeze), a workery
+dostają je po forku jako strony współdzielone (copy-on-write). Zamrożonych obiektów
+nie odwiedza GC workera, więc nie kopiuje on przy tym stron rodzica.
+
+Kilka workerów (DAWID_WORKERS) jest dozwolonych tylko z DAWID_STORAGE=sqlite. Magazyny
+JSON i mmap trzymają wiedzę w pamięci procesu: każdy worker kompaktowałby ten sam
+dziennik i nadpisywał ten sam plik własną wersją bazy, gubiąc naukę pozostałych.
+"""
+
+import gc
+import os
+
+wsgi_app = 'app:create_app(preload=True)'
+bind = os.environ.get('DAWID_BIND', '0.0.0.0:5000')
+shared_storage = os.environ.get('DAWID_STORAGE', 'json') == 'sqlite'
+workers = int(os.environ.get('DAWID_WORKERS', 2 if shared_storage else 1))
+if workers > 1 and not shared_storage:
+    raise RuntimeError("Kilka workerów wymaga DAWID_STORAGE=sqlite - przy JSON i mmap workery nadpisywałyby "
+                       "sobie nawzajem bazę wiedzy")
+preload_app = True
+
+# Plik konfiguracji jest wykonywany przed wczytaniem aplikacji: bez GC w trakcie
+# wczytywania wiedzy nie powstają dziury w stronach, które potem zamrozimy
+gc.disable()
+
+
+def when_ready(server):
+    # Wywoływane w procesie głównym po wczytaniu aplikacji, przed forkiem workerów
+    gc.freeze()
+    gc.enable()
+
+
+def post_fork(server, worker):
+    from app import get_dawid
+
+    get_dawid().after_fork()
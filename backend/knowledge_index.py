@@ -0,0 +1,186 @@
+"""
+Binarny indeks bazy wiedzy otwierany przez mmap
+===============================================
+Start nie wymaga parsowania całego JSON-a: plik jest mapowany do pamięci,
+a pytania wyszukiwane bezpośrednio w nim przez tablicę haszującą. System
+wczytuje tylko te strony, o które ktoś faktycznie zapytał.
+
+Układ pliku (little-endian):
+
+    nagłówek  MAGIC, wersja, liczba szczelin (potęga 2), liczba wpisów
+    szczeliny po 16 B: 8 B skrótu blake2b pytania, 8 B przesunięcia rekordu (0 = pusta)
+    rekordy   u32 długość + pytanie (UTF-8), u32 liczba odpowiedzi, dla każdej u32 długość + tekst
+    numery    po 8 B przesunięcie każdego rekordu w kolejności zapisu (od wersji 2) - wznowienie
+              stronicowania od n-tego wpisu to jeden odczyt, bez zbierania przesunięć w pamięci
+
+Budowa z JSON-a: python knowledge_io.py index dawid_data.json dawid_data.idx
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from itertools import islice
+from collections.abc import Mapping
+from hashlib import blake2b
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sequence, Tuple
+
+MAGIC = b'DAWIDIDX'
+VERSION = 2
+# Wersja 1 nie ma sekcji numerów; MmapStorage przepisuje ją przy wczytaniu
+SUPPORTED_VERSIONS = (1, 2)
+HEADER = struct.Struct('<8sIQQ')
+SLOT = struct.Struct('<QQ')
+LENGTH = struct.Struct('<I')
+OFFSET = struct.Struct('<Q')
+
+
+def question_hash(question: bytes) -> int:
+    return int.from_bytes(blake2b(question, digest_size=8).digest(), 'little')
+
+
+def _slot_count(entries: int) -> int:
+    """Wypełnienie tablicy najwyżej w połowie - sondowanie liniowe zostaje krótkie"""
+    slots = 8
+    while slots < entries * 2:
+        slots *= 2
+    return slots
+
+
+def build_index(path: Path, entries: Iterable[Tuple[str, Sequence[str]]], count: int):
+    """Zapisuje indeks atomowo (plik tymczasowy + os.replace).
+
+    entries to unikalne, znormalizowane pytania; count - ich liczba (potrzebna
+    z góry, bo rozmiar tablicy szczelin zależy od niej). Rekordy są zapisywane
+    strumieniowo, w pamięci zostaje tylko 16 B na wpis; przesunięcia rekordów
+    lądują też na końcu pliku jako sekcja numerów.
+    """
+    path = Path(path)
+    slots = _slot_count(count)
+    records_offset = HEADER.size + slots * SLOT.size
+    hashes, offsets = array('Q'), array('Q')
+
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.seek(records_offset)
+        written = 0
+        for question, answers in entries:
+            encoded = question.encode('utf-8')
+            hashes.append(question_hash(encoded))
+            offsets.append(f.tell())
+            parts = [LENGTH.pack(len(encoded)), encoded, LENGTH.pack(len(answers))]
+            for answer in answers:
+                answer = answer.encode('utf-8')
+                parts += [LENGTH.pack(len(answer)), answer]
+            f.write(b''.join(parts))
+            written += 1
+        if written != count:
+            raise ValueError(f"Zadeklarowano {count} wpisów, a zapisano {written}")
+        if sys.byteorder == 'big':
+            offsets.byteswap()
+        f.write(offsets.tobytes())
+        if sys.byteorder == 'big':
+            offsets.byteswap()
+
+        table = bytearray(slots * SLOT.size)
+        mask = slots - 1
+        for hash_value, offset in zip(hashes, offsets):
+            slot = hash_value & mask
+            while SLOT.unpack_from(table, slot * SLOT.size)[1]:
+                slot = (slot + 1) & mask
+            SLOT.pack_into(table, slot * SLOT.size, hash_value, offset)
+
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, slots, count))
+        f.write(table)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class KnowledgeIndex(Mapping):
+    """Indeks tylko do odczytu: pytanie -> krotka odpowiedzi, czytany wprost z mmap"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.version, self._slots, self._count = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or self.version not in SUPPORTED_VERSIONS:
+            raise ValueError(f"{self.path} nie jest indeksem wiedzy w wersji {VERSION}")
+        self._mask = self._slots - 1
+        self._records_offset = HEADER.size + self._slots * SLOT.size
+        self._numbers_offset = len(self._mm) - self._count * OFFSET.size
+
+    def _read_record(self, offset: int) -> Tuple[str, Tuple[str, ...], int]:
+        """Zwraca (pytanie, odpowiedzi, przesunięcie następnego rekordu)"""
+        mm = self._mm
+        length, = LENGTH.unpack_from(mm, offset)
+        offset += LENGTH.size
+        question = mm[offset:offset + length].decode('utf-8')
+        offset += length
+        count, = LENGTH.unpack_from(mm, offset)
+        offset += LENGTH.size
+        answers = []
+        for _ in range(count):
+            length, = LENGTH.unpack_from(mm, offset)
+            offset += LENGTH.size
+            answers.append(mm[offset:offset + length].decode('utf-8'))
+            offset += length
+        return question, tuple(answers), offset
+
+    def get(self, question: str, default=None) -> Optional[Tuple[str, ...]]:
+        encoded = question.encode('utf-8')
+        hash_value = question_hash(encoded)
+        mm = self._mm
+        slot = hash_value & self._mask
+        while True:
+            slot_hash, offset = SLOT.unpack_from(mm, HEADER.size + slot * SLOT.size)
+            if not offset:
+                return default
+            if slot_hash == hash_value:
+                length, = LENGTH.unpack_from(mm, offset)
+                start = offset + LENGTH.size
+                if mm[start:start + length] == encoded:
+                    return self._read_record(offset)[1]
+            slot = (slot + 1) & self._mask
+
+    def __getitem__(self, question: str) -> Tuple[str, ...]:
+        answers = self.get(question)
+        if answers is None:
+            raise KeyError(question)
+        return answers
+
+    def __contains__(self, question) -> bool:
+        return isinstance(question, str) and self.get(question) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for question, _ in self.items():
+            yield question
+
+    def items(self) -> Iterator[Tuple[str, Tuple[str, ...]]]:
+        """Wpisy w kolejności zapisu, jednym przejściem po pliku"""
+        return self.items_from(0)
+
+    def items_from(self, position: int) -> Iterator[Tuple[str, Tuple[str, ...]]]:
+        """Wpisy od podanego numeru (w kolejności zapisu), bez czytania wcześniejszych rekordów"""
+        position = max(0, position)
+        if position >= self._count:
+            return
+        if self.version < 2:
+            # Bez sekcji numerów zostaje przejście od początku (stała pamięć, liniowy czas)
+            yield from islice(self._records(self._records_offset, self._count), position, None)
+            return
+        offset, = OFFSET.unpack_from(self._mm, self._numbers_offset + position * OFFSET.size)
+        yield from self._records(offset, self._count - position)
+
+    def _records(self, offset: int, count: int) -> Iterator[Tuple[str, Tuple[str, ...]]]:
+        for _ in range(count):
+            question, answers, offset = self._read_record(offset)
+            yield question, answers
+
+    def __len__(self) -> int:
+        return self._count
+
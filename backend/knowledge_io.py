@@ -0,0 +1,180 @@
+"""
+Eksport i import bazy wiedzy
+============================
+Stronicowanie kursorem (wznowienie bez przechodzenia wcześniejszych wpisów)
+i strumieniowy eksport NDJSON. Wpisy są czytane z magazynu po jednym, więc
+zużycie pamięci nie zależy od rozmiaru bazy.
+
+Import (NDJSON albo CSV) czyta plik strumieniowo i dodaje wpisy paczkami,
+a na dysk zapisuje raz, na końcu:
+
+    python knowledge_io.py import wiedza.ndjson
+    python knowledge_io.py import wiedza.csv --format csv --storage sqlite
+
+Binarny indeks dla MmapStorage (DAWID_STORAGE=mmap) buduje się z JSON-a:
+
+    python knowledge_io.py index dawid_data.json dawid_data.idx
+"""
+
+import argparse
+import csv
+import json
+import logging
+import zlib
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from storage import KnowledgeStorage, MmapStorage, create_storage, normalize_question
+
+MAX_PAGE_SIZE = 1000
+# Najwięcej wpisów przeglądanych na jedną stronę z prefiksem
+MAX_PAGE_SCAN = 10000
+IMPORT_BATCH_SIZE = 1000
+# Co ile wpisów wypychać skompresowane dane do klienta
+GZIP_FLUSH_EVERY = 500
+
+
+def knowledge_page(storage: KnowledgeStorage, cursor: int = 0, limit: int = 100, prefix: str = '') -> dict:
+    """Jedna strona wpisów i kursor następnej (None na końcu).
+
+    Przy prefiksie strona może być niepełna (nawet pusta), a kursor i tak wskazuje dalszą
+    część bazy - jedno żądanie przegląda najwyżej MAX_PAGE_SCAN wpisów.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    items = []
+    next_cursor = None
+    for position, question, answers in storage.iter_entries(cursor, prefix, MAX_PAGE_SCAN):
+        if question is None or len(items) == limit:
+            # Wyczerpany budżet albo pełna strona (i wiadomo, że jest dalej)
+            next_cursor = position if question is None else cursor
+            break
+        items.append({'question': question, 'answers': list(answers)})
+        cursor = position
+    return {'items': items, 'next_cursor': None if next_cursor is None else str(next_cursor)}
+
+
+def parse_cursor(value: Optional[str]) -> int:
+    try:
+        return max(0, int(value or 0))
+    except ValueError:
+        return 0
+
+
+def iter_ndjson(storage: KnowledgeStorage, prefix: str = '') -> Iterator[bytes]:
+    for _, question, answers in storage.iter_entries(0, prefix):
+        line = json.dumps({'question': question, 'answers': list(answers)}, ensure_ascii=False)
+        yield (line + '\n').encode('utf-8')
+
+
+def gzip_stream(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """Kompresuje strumień w locie (format gzip), bez buforowania całości"""
+    compressor = zlib.compressobj(wbits=31)
+    for i, chunk in enumerate(chunks, 1):
+        data = compressor.compress(chunk)
+        if i % GZIP_FLUSH_EVERY == 0:
+            data += compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _ndjson_records(stream: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """Linie {"question", "answer"} albo {"question", "answers": [...]} - ten drugi to format eksportu"""
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            logging.warning(f"Import: pominięto uszkodzoną linię {line_number}")
+            continue
+        if not isinstance(entry, dict):
+            continue
+        answers = entry.get('answers', [entry.get('answer')])
+        if not isinstance(answers, list):
+            continue
+        for answer in answers:
+            yield entry.get('question'), answer
+
+
+def _csv_records(stream: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """Kolumny: pytanie, odpowiedź; opcjonalny nagłówek question,answer jest pomijany"""
+    for row_number, row in enumerate(csv.reader(stream), 1):
+        if len(row) < 2:
+            continue
+        if row_number == 1 and [cell.strip().lower() for cell in row[:2]] == ['question', 'answer']:
+            continue
+        yield row[0], row[1]
+
+
+def iter_records(stream: Iterable[str], fmt: str = 'ndjson') -> Iterator[Tuple[str, str]]:
+    """Pary (znormalizowane pytanie, odpowiedź) czytane ze strumienia; puste wpisy są pomijane"""
+    if fmt == 'ndjson':
+        records = _ndjson_records(stream)
+    elif fmt == 'csv':
+        records = _csv_records(stream)
+    else:
+        raise ValueError(f"Nieznany format importu: {fmt}")
+
+    for question, answer in records:
+        if not isinstance(question, str) or not isinstance(answer, str):
+            continue
+        question, answer = normalize_question(question), answer.strip()
+        if question and answer:
+            yield question, answer
+
+
+def import_records(storage: KnowledgeStorage, records: Iterable[Tuple[str, str]],
+                   batch_size: int = IMPORT_BATCH_SIZE) -> Dict[str, int]:
+    """Dodaje rekordy paczkami; powtórzone odpowiedzi pomija magazyn. Zapis na dysk raz, na końcu.
+
+    add_many nie pisze do dziennika, więc zapis jest w finally - import przerwany w połowie
+    (np. błędem kodowania) nie zostawia dodanych już paczek tylko w pamięci.
+    """
+    records = iter(records)
+    total = added = 0
+    try:
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                break
+            total += len(batch)
+            added += storage.add_many(batch)
+    finally:
+        storage.save()
+    return {'records': total, 'added': added}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import i eksport bazy wiedzy Dawida")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = commands.add_parser('import', help="wczytuje plik NDJSON albo CSV do bazy wiedzy")
+    import_parser.add_argument('file')
+    import_parser.add_argument('--format', choices=['ndjson', 'csv'], default='ndjson')
+    import_parser.add_argument('--storage', choices=['json', 'sqlite', 'mmap'], default='json')
+    import_parser.add_argument('--data-file', help="plik bazy (domyślnie dawid_data.json / .db / .idx)")
+    import_parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE)
+    index_parser = commands.add_parser('index', help="buduje binarny indeks (mmap) z pliku JSON")
+    index_parser.add_argument('data_file', nargs='?', default='dawid_data.json')
+    index_parser.add_argument('index_file', nargs='?', default='dawid_data.idx')
+    args = parser.parse_args()
+
+    if args.command == 'index':
+        count = MmapStorage.build_from_json(Path(args.data_file), Path(args.index_file))
+        print(f"Zapisano {count} pytań do {args.index_file}")
+        return
+
+    storage = create_storage(args.storage, args.data_file)
+    try:
+        with open(args.file, encoding='utf-8', newline='') as stream:
+            stats = import_records(storage, iter_records(stream, args.format), args.batch_size)
+        print(f"Wczytano {stats['records']} rekordów, nowych odpowiedzi: {stats['added']}, "
+              f"pytań w bazie: {len(storage)}")
+    finally:
+        storage.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Logowanie bez blokowania wątków obsługujących żądania
+=====================================================
+Rekordy trafiają do ograniczonej kolejki, a na dysk zapisuje je osobny wątek
+(QueueListener). Plik jest rotowany po przekroczeniu rozmiaru albo po upływie
+czasu, a liczba kopii jest stała - zajętość dysku ma więc górną granicę.
+"""
+
+import atexit
+import json
+import logging
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+
+from metrics import ERRORS
+
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+_listener: Optional[QueueListener] = None
+
+
+class SizeAndTimeRotatingFileHandler(RotatingFileHandler):
+    """Rotacja po przekroczeniu max_bytes albo co interval sekund (0 wyłącza rotację czasową)"""
+
+    def __init__(self, filename: str, max_bytes: int, backup_count: int, interval: float):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+        self.interval = interval
+        self.rollover_at = time.time() + interval
+
+    def shouldRollover(self, record) -> bool:
+        if self.interval and time.time() >= self.rollover_at:
+            return True
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self):
+        super().doRollover()
+        self.rollover_at = time.time() + self.interval
+
+
+class JsonFormatter(logging.Formatter):
+    """Jeden obiekt JSON na linię"""
+
+    def format(self, record) -> str:
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Gdy kolejka jest pełna, rekord jest porzucany zamiast blokować żądanie"""
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            ERRORS.inc('logging_dropped')
+
+
+def setup_logging(log_file: str = 'dawid.log', level: int = logging.INFO, max_bytes: int = 5 * 1024 * 1024,
+                  backup_count: int = 3, rotate_interval: float = 24 * 60 * 60, json_lines: bool = False,
+                  queue_size: int = 10000):
+    """Konfiguruje logger główny; kolejne wywołania nic nie zmieniają"""
+    global _listener
+    if _listener is not None:
+        return
+
+    file_handler = SizeAndTimeRotatingFileHandler(log_file, max_bytes, backup_count, rotate_interval)
+    file_handler.setFormatter(JsonFormatter() if json_lines else logging.Formatter(TEXT_FORMAT))
+
+    log_queue = queue.Queue(maxsize=queue_size)
+    _listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(DroppingQueueHandler(log_queue))
+
+
+def restart_after_fork():
+    """W procesie potomnym wątek QueueListener nie istnieje - nowa kolejka i nowy wątek"""
+    global _listener
+    if _listener is None:
+        return
+    log_queue = queue.Queue(maxsize=_listener.queue.maxsize)
+    _listener = QueueListener(log_queue, *_listener.handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, DroppingQueueHandler):
+            handler.queue = log_queue
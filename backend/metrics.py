@@ -0,0 +1,124 @@
+"""
+Metryki w formacie Prometheusa (/metrics)
+=========================================
+Bez zależności zewnętrznych. Zapis metryki to jedno krótkie wejście pod
+blokadę danej metryki (kilka operacji na liczbach), więc na gorącej ścieżce
+koszt jest pomijalny. Formatowanie tekstu odbywa się dopiero przy odczycie.
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, List, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ''
+    pairs = ','.join(f'{name}="{value}"' for name, value in zip(names, values))
+    return f'{{{pairs}}}'
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = list(self._values.items())
+        for label_values, value in values:
+            lines.append(f"{self.name}{format_labels(self.label_names, label_values)} {value:g}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self.buckets = tuple(buckets)
+        # Etykiety -> [liczniki kubełków..., +Inf, suma]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(label_values)
+            if counts is None:
+                counts = self._values[label_values] = [0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            values = [(label_values, list(counts)) for label_values, counts in self._values.items()]
+        label_names = self.label_names + ('le',)
+        for label_values, counts in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else f'{bound:g}'
+                lines.append(f"{self.name}_bucket{format_labels(label_names, label_values + (le,))} {cumulative}")
+            labels = format_labels(self.label_names, label_values)
+            lines.append(f"{self.name}_sum{labels} {counts[-1]:g}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """Wartość liczona przy odczycie, np. rozmiar bazy wiedzy"""
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], float] = lambda: 0):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge",
+                f"{self.name} {self.callback():g}"]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    'dawid_http_requests_total', 'Liczba żądań HTTP', ('endpoint', 'status')))
+HTTP_LATENCY = REGISTRY.register(Histogram(
+    'dawid_http_request_duration_seconds', 'Czas obsługi żądania HTTP', ('endpoint',)))
+MESSAGE_LATENCY = REGISTRY.register(Histogram(
+    'dawid_message_duration_seconds',
+    'Czas process_message wg ścieżki (math, math_rejected, answer, learning, learn, skip)', ('branch',)))
+ERRORS = REGISTRY.register(Counter(
+    'dawid_errors_total', 'Liczba błędów', ('source',)))
+FLUSH_LATENCY = REGISTRY.register(Histogram(
+    'dawid_persistence_flush_duration_seconds', 'Czas zapisu wiedzy na dysk w tle',
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)))
+KNOWLEDGE_SIZE = REGISTRY.register(Gauge(
+    'dawid_knowledge_base_size', 'Liczba pytań w bazie wiedzy'))
@@ -0,0 +1,182 @@
+import atexit
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterator, Tuple
+
+from metrics import ERRORS, FLUSH_LATENCY
+
+
+def atomic_write_json(path: Path, data) -> None:
+    """Zapisuje JSON do pliku tymczasowego i podmienia go atomowo przez rename"""
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class LearningJournal:
+    """Dziennik nauczonych odpowiedzi - jedna linia JSON na parę (pytanie, odpowiedź).
+
+    Dopisywanie kosztuje O(1) niezależnie od rozmiaru bazy wiedzy. Przy kompaktowaniu
+    dziennik jest przenoszony do pliku `.1`, a po udanym zapisie snapshotu usuwany.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.rotated_path = path.with_name(f"{path.name}.1")
+        self._lock = threading.Lock()
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    @property
+    def size(self) -> int:
+        return self._file.tell()
+
+    def append(self, question: str, answer: str):
+        line = json.dumps({'q': question, 'a': answer}, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + '\n')
+            # Bez fsync - wystarczy, że dane trafią do systemu (przeżyją awarię procesu)
+            self._file.flush()
+
+    def sync(self):
+        """Wymusza zapis dziennika na dysk"""
+        with self._lock:
+            os.fsync(self._file.fileno())
+
+    def rotate(self):
+        """Odkłada bieżący dziennik na bok i zaczyna nowy.
+
+        Plik `.1` pozostały po nieudanym kompaktowaniu to jedyna trwała kopia tamtych
+        wpisów - wtedy bieżący dziennik jest do niego dopisywany, a nie go zastępuje.
+        """
+        with self._lock:
+            self._file.close()
+            if self.rotated_path.exists():
+                with open(self.path, 'rb') as source, open(self.rotated_path, 'r+b') as target:
+                    # Ucięta ostatnia linia nie może skleić się z pierwszym dopisanym wpisem
+                    if target.seek(0, os.SEEK_END):
+                        target.seek(-1, os.SEEK_END)
+                        if target.read(1) != b'\n':
+                            target.write(b'\n')
+                    shutil.copyfileobj(source, target)
+                    target.flush()
+                    os.fsync(target.fileno())
+                # Awaria przed wyczyszczeniem zostawi wpisy w obu plikach - odtwarzanie je scali
+                self._file = open(self.path, 'w', encoding='utf-8')
+            else:
+                os.replace(self.path, self.rotated_path)
+                self._file = open(self.path, 'a', encoding='utf-8')
+
+    def discard_rotated(self):
+        self.rotated_path.unlink(missing_ok=True)
+
+    def reopen(self):
+        """Po forku: własny deskryptor, żeby procesy nie dzieliły pozycji w pliku"""
+        self._lock = threading.Lock()
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    @staticmethod
+    def replay(*paths: Path) -> Iterator[Tuple[str, str]]:
+        """Odtwarza wpisy z podanych plików dziennika, w kolejności"""
+        for path in paths:
+            if not path.exists():
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                for line_number, line in enumerate(f, 1):
+                    try:
+                        entry = json.loads(line)
+                        yield entry['q'], entry['a']
+                    except (ValueError, KeyError) as e:
+                        # Zwykle ucięta ostatnia linia po awarii
+                        logging.warning(f"Pominięto uszkodzony wpis {path.name}:{line_number}: {e}")
+
+
+class WriteBehindSaver:
+    """Zapisuje dane w tle - po upływie interwału albo po N zmianach.
+
+    Wątki obsługujące żądania tylko zgłaszają zmianę (mark_dirty),
+    a właściwy zapis na dysk wykonuje osobny wątek.
+    """
+
+    def __init__(self, save: Callable[[], None], interval: float = 5.0, max_pending: int = 20):
+        self._save = save
+        self.interval = interval
+        self.max_pending = max_pending
+        self._pending = 0
+        self._closed = False
+        self._start()
+        atexit.register(self.close)
+
+    def _start(self):
+        self._condition = threading.Condition()
+        # Chroni przed równoległym zapisem z wątku w tle i z flush()
+        self._save_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="dawid-saver", daemon=True)
+        self._thread.start()
+
+    def after_fork(self):
+        """W procesie potomnym wątek zapisu nie istnieje, a blokady mogły zostać zajęte - start od nowa"""
+        self._closed = False
+        self._start()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def mark_dirty(self):
+        with self._condition:
+            self._pending += 1
+            if self._pending >= self.max_pending:
+                self._condition.notify()
+
+    def flush(self):
+        """Zapisuje natychmiast, jeśli są niezapisane zmiany"""
+        with self._condition:
+            pending, self._pending = self._pending, 0
+        if pending:
+            self._do_save(pending)
+
+    def close(self):
+        """Zatrzymuje wątek zapisu i zapisuje ostatnie zmiany"""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        self.flush()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._closed and self._pending < self.max_pending:
+                    self._condition.wait(self.interval)
+                if self._closed:
+                    return
+                pending, self._pending = self._pending, 0
+            if pending:
+                self._do_save(pending)
+
+    def _do_save(self, pending: int):
+        try:
+            with self._save_lock:
+                start = time.perf_counter()
+                self._save()
+                FLUSH_LATENCY.observe(time.perf_counter() - start)
+        except Exception as e:
+            ERRORS.inc('persistence')
+            logging.error(f"Błąd podczas zapisywania w tle: {e}")
+            # Zmiany wracają do kolejki - spróbujemy przy następnym cyklu
+            with self._condition:
+                self._pending += pending
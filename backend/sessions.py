@@ -0,0 +1,48 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Tuple, TypeVar
+
+T = TypeVar('T')
+
+
+class SessionStore(Generic[T]):
+    """Ograniczony magazyn sesji: LRU z wygasaniem po czasie (TTL).
+
+    Kolejność w OrderedDict to kolejność ostatniego użycia, a TTL jest
+    wspólny dla wszystkich sesji, więc wygasłe sesje zawsze leżą na początku.
+    Dzięki temu odczyt, wstawienie i usuwanie kosztują zamortyzowane O(1).
+    """
+
+    def __init__(self, factory: Callable[[], T], max_sessions: int = 10000, ttl: float = 30 * 60):
+        self._factory = factory
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._sessions: "OrderedDict[str, Tuple[float, T]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> T:
+        """Zwraca sesję o podanym id, tworząc nową, jeśli nie istnieje lub wygasła"""
+        now = time.monotonic()
+        with self._lock:
+            self._evict_expired(now)
+            entry = self._sessions.pop(session_id, None)
+            session = entry[1] if entry is not None else self._factory()
+            self._sessions[session_id] = (now + self.ttl, session)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+            return session
+
+    def discard(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _evict_expired(self, now: float):
+        while self._sessions:
+            expires_at, _ = next(iter(self._sessions.values()))
+            if expires_at > now:
+                break
+            self._sessions.popitem(last=False)
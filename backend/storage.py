@@ -0,0 +1,763 @@
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+from abc import abstractmethod
+from collections.abc import Mapping
+from itertools import chain, groupby, islice
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from fuzzy import MAX_CANDIDATES, MAX_SCANNED_POSTINGS, TrigramIndex, probe_count, size_bounds, trigrams
+from knowledge_index import VERSION as INDEX_VERSION, KnowledgeIndex, build_index
+from persistence import LearningJournal, WriteBehindSaver, atomic_write_json
+
+PUNCTUATION_RE = re.compile(r'[^\w\s]')
+
+# Odpowiedzi pytania jako numery z AnswerPool: jedna - sam numer, kilka - krotka, wiele - zbiór
+AnswerRef = Union[int, Tuple[int, ...], FrozenSet[int]]
+
+
+def normalize_question(text: str) -> str:
+    """Sprowadza pytanie do postaci używanej jako klucz bazy wiedzy"""
+    return PUNCTUATION_RE.sub('', text.lower()).strip()
+
+
+class KnowledgeStorage(Mapping):
+    """Magazyn wiedzy: znormalizowane pytanie -> odpowiedzi.
+
+    Z zewnątrz zachowuje się jak słownik tylko do odczytu,
+    zmiany przechodzą wyłącznie przez add_answer.
+    """
+
+    @abstractmethod
+    def load(self):
+        """Wczytuje stan z dysku"""
+
+    @abstractmethod
+    def add_answer(self, question: str, answer: str) -> bool:
+        """Dodaje odpowiedź; zwraca False, jeśli była już znana"""
+
+    @abstractmethod
+    def add_many(self, pairs: Iterable[Tuple[str, str]]) -> int:
+        """Dodaje paczkę par (pytanie, odpowiedź) naraz, bez zapisu na dysk po każdej.
+
+        Zwraca liczbę nowych odpowiedzi; trwałość zapewnia dopiero save().
+        """
+
+    @abstractmethod
+    def get_answers(self, question: str) -> Optional[Sequence[str]]:
+        """Zwraca odpowiedzi dla znormalizowanego pytania"""
+
+    def find_similar(self, question: str, threshold: float) -> Optional[str]:
+        """Zwraca najbardziej podobne zapamiętane pytanie (podobieństwo >= threshold)"""
+        return None
+
+    @abstractmethod
+    def iter_entries(self, cursor: int = 0, prefix: str = '',
+                     max_scan: Optional[int] = None) -> Iterator[Tuple[int, Optional[str], Optional[Sequence[str]]]]:
+        """Przechodzi po wpisach w stałej kolejności, zaczynając za kursorem (wznowienie bez
+        przechodzenia wcześniejszych wpisów).
+
+        Zwraca trójki (kursor następnego wpisu, pytanie, odpowiedzi) - bez kopiowania całej bazy.
+        Gdy przejrzano max_scan wpisów, a są kolejne, na koniec zwraca (kursor, None, None) -
+        miejsce wznowienia; dzięki temu prefiks, który nic nie pasuje, nie przegląda całej bazy.
+        """
+
+    def save(self):
+        """Utrwala cały stan natychmiast"""
+
+    def flush(self):
+        """Utrwala zaległe zmiany"""
+
+    def close(self):
+        pass
+
+    def after_fork(self):
+        """Wywoływane w procesie potomnym po forku (np. worker gunicorna z preload)"""
+
+
+class AnswerPool:
+    """Pula odpowiedzi: każda różna odpowiedź jest trzymana raz, wpisy przechowują tylko jej numer.
+
+    Pula jest tylko dopisywana (pod blokadą piszącego), więc numer raz widoczny
+    w snapshocie zawsze wskazuje tę samą odpowiedź.
+    """
+    __slots__ = ('answers', 'ids')
+
+    # Od tylu odpowiedzi pytania sprawdzanie "czy już jest" przechodzi z krotki na zbiór
+    SET_THRESHOLD = 8
+
+    def __init__(self):
+        self.answers: List[str] = []
+        self.ids: Dict[str, int] = {}
+
+    def add(self, ref: Optional[AnswerRef], answer: str) -> Optional[AnswerRef]:
+        """Zwraca ref rozszerzony o odpowiedź albo None, jeśli już ją zawierał"""
+        answer_id = self.ids.get(answer)
+        if answer_id is None:
+            # Odpowiedzi spoza puli nie ma przy żadnym pytaniu - sprawdzanie kończy się tutaj
+            answer_id = len(self.answers)
+            self.answers.append(answer)
+            self.ids[answer] = answer_id
+        elif ref is not None and (ref == answer_id if isinstance(ref, int) else answer_id in ref):
+            return None
+
+        if ref is None:
+            return answer_id
+        if isinstance(ref, int):
+            return ref, answer_id
+        if isinstance(ref, tuple) and len(ref) < self.SET_THRESHOLD:
+            return ref + (answer_id,)
+        return frozenset(ref) | {answer_id}
+
+    def decode(self, ref: AnswerRef) -> Tuple[str, ...]:
+        answers = self.answers
+        if isinstance(ref, int):
+            return answers[ref],
+        return tuple(answers[answer_id] for answer_id in ref)
+
+
+class KnowledgeSnapshot:
+    """Niezmienna wersja bazy wiedzy: duża baza i mała nakładka ostatnich zmian.
+
+    Po opublikowaniu żaden ze słowników nie jest już modyfikowany, więc czytelnicy
+    mogą z niego korzystać (także iterować) bez blokad. Bazą może być też
+    KnowledgeIndex (MmapStorage) - wtedy wartościami są krotki odpowiedzi.
+    """
+    __slots__ = ('base', 'overlay', 'size')
+
+    def __init__(self, base: Mapping, overlay: Dict[str, AnswerRef], size: int):
+        self.base = base
+        self.overlay = overlay
+        self.size = size
+
+    def get(self, question: str) -> Optional[AnswerRef]:
+        answers = self.overlay.get(question)
+        if answers is None:
+            answers = self.base.get(question)
+        return answers
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.base
+        for question in self.overlay:
+            if question not in self.base:
+                yield question
+
+    def items(self) -> Iterator[Tuple[str, AnswerRef]]:
+        for question in self:
+            yield question, self.get(question)
+
+
+def _scan_entries(entries: Iterable[Tuple[str, AnswerRef]], cursor: int, prefix: str, max_scan: Optional[int],
+                  decode) -> Iterator[Tuple[int, Optional[str], Optional[Sequence[str]]]]:
+    """Wspólna część iter_entries magazynów w pamięci: filtr prefiksu i budżet przeglądania"""
+    entries = iter(entries)
+    for scanned, (question, answers) in enumerate(entries, 1):
+        if question.startswith(prefix):
+            yield cursor + scanned, question, decode(answers)
+        if scanned == max_scan:
+            if next(entries, None) is not None:
+                yield cursor + scanned, None, None
+            return
+
+
+class JournaledStorage(KnowledgeStorage):
+    """Wspólny cykl życia magazynów trzymanych w pamięci (JsonStorage, MmapStorage).
+
+    Nauka trafia od razu do dziennika, WriteBehindSaver w tle go synchronizuje,
+    a gdy dziennik urośnie, _compact zapisuje snapshot (_write_snapshot podklasy)
+    i czyści dziennik. Podklasa ustawia _snapshot i _trigrams w load(), a _snapshot_path
+    wskazuje plik, do którego pisze _write_snapshot.
+    """
+
+    _snapshot_path: Path
+
+    def _start_journal(self, journal_path: Path, flush_interval: float, flush_every: int):
+        # Tylko dla piszących - czytelnicy nigdy nie czekają
+        self._lock = threading.Lock()
+        # Kompaktowania (z wątku w tle i z save()) idą po kolei - starszy snapshot
+        # nie może trafić na dysk po nowszym
+        self._compact_lock = threading.Lock()
+        self._journal = LearningJournal(journal_path)
+        # Czy są zmiany, których nie ma jeszcze w snapshocie na dysku
+        self._dirty = False
+        self.load()
+        if self._dirty or self._journal.rotated_path.exists():
+            # Dziennik po nieczystym zamknięciu albo przerwane kompaktowanie - złóż wszystko
+            # do snapshotu od razu, żeby proces, który nic nie zmienił, nie musiał nic zapisywać
+            self.save()
+        # Stan plików, któremu odpowiada pamięć - after_fork po nim poznaje, że ktoś pisał po nas
+        self._loaded_disk_state = self._disk_state()
+        self._saver = WriteBehindSaver(self._persist, interval=flush_interval, max_pending=flush_every)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._snapshot)
+
+    def __len__(self) -> int:
+        return self._snapshot.size
+
+    def find_similar(self, question: str, threshold: float) -> Optional[str]:
+        match = self._trigrams.search(question, threshold)
+        return match[0] if match else None
+
+    def save(self):
+        """Zapisuje pełny snapshot wiedzy natychmiast i czyści dziennik"""
+        try:
+            self._compact()
+        except Exception as e:
+            logging.error(f"Błąd podczas zapisywania wiedzy: {e}")
+
+    def flush(self):
+        self._saver.flush()
+
+    def close(self):
+        self._saver.close()
+        if self._dirty or self._journal.rotated_path.exists():
+            self.save()
+        self._journal.close()
+
+    def after_fork(self):
+        # Blokada mogła zostać zajęta przez wątek zapisu rodzica, a deskryptor dziennika
+        # współdzieliłby pozycję w pliku z rodzicem
+        self._lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._journal.reopen()
+        # Worker wznowiony przez gunicorna (max-requests, timeout, awaria) dostaje pamięć
+        # rodzica z chwili startu. Jeśli poprzedni worker od tego czasu uczył się albo
+        # kompaktował, trzeba wczytać stan z dysku - inaczej nie widzielibyśmy jego nauki,
+        # a nasze kompaktowanie zapisałoby stary snapshot i skasowało dziennik z jego wpisami
+        if self._disk_state() != self._loaded_disk_state:
+            logging.info("Wiedza na dysku zmieniła się od startu - wczytuję ją ponownie")
+            self.load()
+        self._saver.after_fork()
+
+    def _disk_state(self) -> Tuple[Optional[Tuple[int, int, int]], ...]:
+        def stamp(path: Path) -> Optional[Tuple[int, int, int]]:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                return None
+            return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+        return tuple(stamp(path) for path in (self._snapshot_path, self._journal.path, self._journal.rotated_path))
+
+    def _persist(self):
+        """Wywoływane w tle: utrwala dziennik, a gdy urośnie - składa go do snapshotu"""
+        self._journal.sync()
+        if self._journal.size >= self.compact_threshold:
+            self._compact()
+
+    def _compact(self):
+        with self._compact_lock:
+            with self._lock:
+                snapshot = self._snapshot
+                # Wpisy dopisane od teraz trafią do nowego dziennika (albo zostaną dopisane
+                # do `.1`, jeśli poprzednie kompaktowanie się nie udało)
+                self._journal.rotate()
+                self._dirty = False
+            try:
+                self._write_snapshot(snapshot)
+            except Exception:
+                self._dirty = True
+                raise
+            self._journal.discard_rotated()
+
+    @abstractmethod
+    def _write_snapshot(self, snapshot: KnowledgeSnapshot):
+        """Utrwala niezmienny snapshot; wywoływane poza blokadą piszących"""
+
+
+class JsonStorage(JournaledStorage):
+    """Domyślny magazyn: wiedza w pamięci, snapshot w JSON i dziennik nauki.
+
+    Odczyty idą bez blokady do bieżącego KnowledgeSnapshot. Zapis (pod blokadą)
+    buduje nową wersję i podmienia referencję - kopiowana jest tylko nakładka,
+    a z bazą jest scalana co ok. sqrt(n) zmian. Odpowiedzi są trzymane w AnswerPool,
+    a wpisy przechowują tylko ich numery.
+    """
+
+    def __init__(self, data_file: str = "dawid_data.json", flush_interval: float = 5.0, flush_every: int = 20,
+                 compact_threshold: int = 1024 * 1024):
+        self.data_file = Path(data_file)
+        self._snapshot_path = self.data_file
+        self.compact_threshold = compact_threshold
+        self._snapshot = KnowledgeSnapshot({}, {}, 0)
+        self._pool = AnswerPool()
+        self._trigrams = TrigramIndex()
+        # Pytania w kolejności dodania (tylko dopisywane) - kursor stronicowania to numer na tej liście.
+        # Nowe pytanie trafia tu dopiero po opublikowaniu snapshotu, który je zawiera
+        self._questions: List[str] = []
+        self._start_journal(self.data_file.with_suffix('.journal'), flush_interval, flush_every)
+
+    def __getitem__(self, question: str) -> Tuple[str, ...]:
+        answers = self.get_answers(question)
+        if answers is None:
+            raise KeyError(question)
+        return answers
+
+    def load(self):
+        knowledge_base: Dict[str, AnswerRef] = {}
+        pool = AnswerPool()
+        if self.data_file.exists():
+            try:
+                with open(self.data_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                # Klucze normalizujemy raz przy ładowaniu - wyszukiwanie to potem jedno trafienie w słownik
+                for question, answers in data.get('knowledge_base', {}).items():
+                    for answer in answers:
+                        self._merge(pool, knowledge_base, normalize_question(question), answer)
+            except Exception as e:
+                logging.error(f"Błąd podczas ładowania wiedzy: {e}")
+                print("Wystąpił błąd podczas ładowania wiedzy. Zaczynam od nowa!")
+
+        # Odtwórz naukę zapisaną w dzienniku po ostatnim snapshocie
+        replayed = 0
+        for question, answer in LearningJournal.replay(self._journal.rotated_path, self._journal.path):
+            self._merge(pool, knowledge_base, question, answer)
+            replayed += 1
+        if replayed:
+            logging.info(f"Odtworzono {replayed} wpisów z dziennika nauki")
+
+        trigram_index = TrigramIndex(knowledge_base)
+        with self._lock:
+            self._snapshot = KnowledgeSnapshot(knowledge_base, {}, len(knowledge_base))
+            self._pool = pool
+            self._trigrams = trigram_index
+            self._questions = list(knowledge_base)
+            self._dirty = bool(replayed)
+
+    @staticmethod
+    def _merge(pool: AnswerPool, knowledge_base: Dict[str, AnswerRef], question: str, answer: str) -> bool:
+        ref = pool.add(knowledge_base.get(question), answer)
+        if ref is None:
+            return False
+        knowledge_base[question] = ref
+        return True
+
+    def add_answer(self, question: str, answer: str) -> bool:
+        with self._lock:
+            snapshot = self._snapshot
+            answers = snapshot.get(question)
+            ref = self._pool.add(answers, answer)
+            if ref is None:
+                return False
+
+            overlay = dict(snapshot.overlay)
+            overlay[question] = ref
+            size = snapshot.size + (answers is None)
+            if len(overlay) > max(64, math.isqrt(len(snapshot.base))):
+                base = dict(snapshot.base)
+                base.update(overlay)
+                self._snapshot = KnowledgeSnapshot(base, {}, size)
+            else:
+                self._snapshot = KnowledgeSnapshot(snapshot.base, overlay, size)
+            if answers is None:
+                self._trigrams.add(question)
+                self._questions.append(question)
+
+            self._journal.append(question, answer)
+            self._dirty = True
+
+        self._saver.mark_dirty()
+        return True
+
+    def add_many(self, pairs: Iterable[Tuple[str, str]]) -> int:
+        with self._lock:
+            snapshot = self._snapshot
+            # Jedna nowa wersja bazy na całą paczkę - kopiowana jest tylko tablica słownika, nie dane
+            base = dict(snapshot.base)
+            base.update(snapshot.overlay)
+            added = 0
+            new_questions = []
+            for question, answer in pairs:
+                if question not in base:
+                    self._trigrams.add(question)
+                    new_questions.append(question)
+                added += self._merge(self._pool, base, question, answer)
+            self._snapshot = KnowledgeSnapshot(base, {}, len(base))
+            self._questions.extend(new_questions)
+            self._dirty = self._dirty or added > 0
+        return added
+
+    def get_answers(self, question: str) -> Optional[Sequence[str]]:
+        ref = self._snapshot.get(question)
+        return None if ref is None else self._pool.decode(ref)
+
+    def iter_entries(self, cursor: int = 0, prefix: str = '',
+                     max_scan: Optional[int] = None) -> Iterator[Tuple[int, Optional[str], Optional[Sequence[str]]]]:
+        # Długość listy przed snapshotem: każde pytanie z listy jest już w tym snapshocie
+        questions = self._questions
+        end = len(questions)
+        snapshot, pool = self._snapshot, self._pool
+        entries = ((questions[position], snapshot.get(questions[position])) for position in range(cursor, end))
+        return _scan_entries(entries, cursor, prefix, max_scan, pool.decode)
+
+    def _write_snapshot(self, snapshot: KnowledgeSnapshot):
+        # Snapshot jest niezmienny, więc serializujemy go bez blokady
+        data = {
+            'knowledge_base': {question: list(self._pool.decode(ref)) for question, ref in snapshot.items()},
+        }
+        atomic_write_json(self.data_file, data)
+
+
+class MmapStorage(JournaledStorage):
+    """Baza w binarnym indeksie (KnowledgeIndex) czytanym przez mmap - start bez parsowania JSON-a.
+
+    Nauczone odpowiedzi trafiają do nakładki w pamięci i do dziennika nauki; gdy
+    dziennik urośnie, indeks jest przebudowywany w tle (strumieniowo) i podmieniany.
+    Przybliżone dopasowanie obejmuje tylko pytania spoza indeksu z chwili startu
+    (dziennik i nowa nauka) - indeks trigramów całej bazy oznaczałby wczytanie jej.
+    """
+
+    def __init__(self, index_file: str = "dawid_data.idx", seed_file: Optional[str] = "dawid_data.json",
+                 flush_interval: float = 5.0, flush_every: int = 20, compact_threshold: int = 1024 * 1024):
+        self.index_file = Path(index_file)
+        self._snapshot_path = self.index_file
+        self.seed_file = Path(seed_file) if seed_file else None
+        self.compact_threshold = compact_threshold
+        self._trigrams = TrigramIndex()
+        self._start_journal(self.index_file.with_suffix('.journal'), flush_interval, flush_every)
+
+    def __getitem__(self, question: str) -> Tuple[str, ...]:
+        answers = self._snapshot.get(question)
+        if answers is None:
+            raise KeyError(question)
+        return answers
+
+    @staticmethod
+    def build_from_json(data_file: Path, index_file: Path) -> int:
+        """Buduje indeks z pliku JSON; klucze są normalizowane jak w JsonStorage.load"""
+        with open(data_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        knowledge_base: Dict[str, Tuple[str, ...]] = {}
+        for question, answers in data.get('knowledge_base', {}).items():
+            question = normalize_question(question)
+            merged = knowledge_base.get(question, ())
+            knowledge_base[question] = merged + tuple(a for a in dict.fromkeys(answers) if a not in merged)
+        del data
+        build_index(index_file, knowledge_base.items(), len(knowledge_base))
+        return len(knowledge_base)
+
+    def load(self):
+        # JSON tylko zasila pusty start: nauka żyje w indeksie, więc nowszy (np. po git pull)
+        # plik JSON nie może go nadpisać - przebudowa to jawne `knowledge_io.py index`
+        if not self.index_file.exists():
+            seed = self.seed_file
+            if seed is not None and seed.exists():
+                count = self.build_from_json(seed, self.index_file)
+                logging.info(f"Zbudowano indeks wiedzy {self.index_file} ({count} pytań)")
+            else:
+                build_index(self.index_file, (), 0)
+        index = KnowledgeIndex(self.index_file)
+        if index.version < INDEX_VERSION:
+            # Starszy format (bez sekcji numerów) - przepisujemy go raz, strumieniowo z niego samego
+            build_index(self.index_file, index.items(), len(index))
+            logging.info(f"Przepisano indeks wiedzy {self.index_file} do wersji {INDEX_VERSION}")
+            index = KnowledgeIndex(self.index_file)
+
+        overlay: Dict[str, Tuple[str, ...]] = {}
+        for question, answer in LearningJournal.replay(self._journal.rotated_path, self._journal.path):
+            answers = overlay.get(question) or index.get(question, ())
+            if answer not in answers:
+                overlay[question] = answers + (answer,)
+        size = len(index) + sum(question not in index for question in overlay)
+
+        trigram_index = TrigramIndex(question for question in overlay if question not in index)
+        with self._lock:
+            self._snapshot = KnowledgeSnapshot(index, overlay, size)
+            self._trigrams = trigram_index
+            self._dirty = bool(overlay)
+
+    def add_answer(self, question: str, answer: str) -> bool:
+        with self._lock:
+            snapshot = self._snapshot
+            answers = snapshot.get(question)
+            if answers is not None and answer in answers:
+                return False
+            if answers is None:
+                self._trigrams.add(question)
+
+            overlay = dict(snapshot.overlay)
+            overlay[question] = (answers or ()) + (answer,)
+            self._snapshot = KnowledgeSnapshot(snapshot.base, overlay, snapshot.size + (answers is None))
+            self._journal.append(question, answer)
+            self._dirty = True
+
+        self._saver.mark_dirty()
+        return True
+
+    def add_many(self, pairs: Iterable[Tuple[str, str]]) -> int:
+        with self._lock:
+            snapshot = self._snapshot
+            overlay = dict(snapshot.overlay)
+            size = snapshot.size
+            added = 0
+            for question, answer in pairs:
+                answers = overlay.get(question) or snapshot.base.get(question)
+                if answers is not None and answer in answers:
+                    continue
+                if answers is None:
+                    self._trigrams.add(question)
+                overlay[question] = (answers or ()) + (answer,)
+                size += answers is None
+                added += 1
+                # Bez dziennika: import kończy się save(), które przebudowuje indeks
+            self._snapshot = KnowledgeSnapshot(snapshot.base, overlay, size)
+            self._dirty = self._dirty or added > 0
+        return added
+
+    def get_answers(self, question: str) -> Optional[Sequence[str]]:
+        return self._snapshot.get(question)
+
+    def iter_entries(self, cursor: int = 0, prefix: str = '',
+                     max_scan: Optional[int] = None) -> Iterator[Tuple[int, Optional[str], Optional[Sequence[str]]]]:
+        # Kursor to numer wpisu: najpierw rekordy indeksu, potem pytania spoza niego w kolejności
+        # nakładki. Przebudowa zapisuje je w tej samej kolejności, więc numery są stałe
+        snapshot = self._snapshot
+        base, overlay = snapshot.base, snapshot.overlay
+        entries = chain(
+            ((question, overlay.get(question, answers)) for question, answers in base.items_from(cursor)),
+            islice(((question, answers) for question, answers in overlay.items() if question not in base),
+                   max(0, cursor - len(base)), None),
+        )
+        return _scan_entries(entries, cursor, prefix, max_scan, tuple)
+
+    def _write_snapshot(self, snapshot: KnowledgeSnapshot):
+        """Przebudowuje indeks z nakładką i podmienia mapowanie"""
+        if not snapshot.overlay:
+            return
+        # Pytania z nakładki są w pełnej postaci (z odpowiedziami z indeksu), więc nowy
+        # indeks to po prostu wpisy snapshotu; czytelnicy dalej korzystają ze starego mmap
+        build_index(self.index_file, self._merged_entries(snapshot), snapshot.size)
+        index = KnowledgeIndex(self.index_file)
+        with self._lock:
+            current = self._snapshot
+            # Zostaw w nakładce tylko to, co zmieniło się w trakcie przebudowy
+            overlay = {question: answers for question, answers in current.overlay.items()
+                       if snapshot.overlay.get(question) is not answers}
+            self._snapshot = KnowledgeSnapshot(index, overlay, current.size)
+
+    @staticmethod
+    def _merged_entries(snapshot: KnowledgeSnapshot) -> Iterator[Tuple[str, Sequence[str]]]:
+        overlay = snapshot.overlay
+        for question, answers in snapshot.base.items():
+            yield question, overlay.get(question, answers)
+        for question, answers in overlay.items():
+            if question not in snapshot.base:
+                yield question, answers
+
+
+class SqliteStorage(KnowledgeStorage):
+    """Magazyn w SQLite (WAL) - współdzielony przez wiele workerów gunicorna.
+
+    Każdy wątek (i każdy proces po forku) ma własne, ponownie używane połączenie.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS questions (
+            id INTEGER PRIMARY KEY,
+            question TEXT NOT NULL UNIQUE,
+            grams INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS answers (
+            question_id INTEGER NOT NULL REFERENCES questions(id),
+            answer TEXT NOT NULL,
+            PRIMARY KEY (question_id, answer)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS trigrams (
+            gram TEXT NOT NULL,
+            question_id INTEGER NOT NULL REFERENCES questions(id),
+            PRIMARY KEY (gram, question_id)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS gram_counts (
+            gram TEXT PRIMARY KEY,
+            questions INTEGER NOT NULL
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, db_file: str = "dawid_data.db", seed_file: Optional[str] = "dawid_data.json"):
+        self.db_file = Path(db_file)
+        self.seed_file = Path(seed_file) if seed_file else None
+        self._local = threading.local()
+        self.load()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        # Połączenie odziedziczone po forku nie może być używane w nowym procesie
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_file, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def __getitem__(self, question: str) -> List[str]:
+        answers = self.get_answers(question)
+        if answers is None:
+            raise KeyError(question)
+        return answers
+
+    def __iter__(self) -> Iterator[str]:
+        cursor = self._connection().execute("SELECT question FROM questions ORDER BY id")
+        for (question,) in cursor:
+            yield question
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM questions").fetchone()[0]
+
+    def load(self):
+        conn = self._connection()
+        with conn:
+            conn.executescript(self.SCHEMA)
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(questions)")]
+            if 'grams' not in columns:
+                conn.execute("ALTER TABLE questions ADD COLUMN grams INTEGER")
+            # Baza sprzed dopasowania przybliżonego (albo sprzed liczników trigramów) - uzupełnij indeks
+            if conn.execute("SELECT 1 FROM questions WHERE grams IS NULL LIMIT 1").fetchone() is not None:
+                conn.execute("DELETE FROM trigrams")
+                conn.execute("DELETE FROM gram_counts")
+                for question_id, question in conn.execute("SELECT id, question FROM questions").fetchall():
+                    self._index_trigrams(conn, question_id, question)
+
+        # Pierwsze uruchomienie: przenieś wiedzę z pliku JSON
+        if self.seed_file and self.seed_file.exists() and len(self) == 0:
+            try:
+                with open(self.seed_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                imported = 0
+                with conn:
+                    for question, answers in data.get('knowledge_base', {}).items():
+                        for answer in answers:
+                            imported += self._insert(conn, normalize_question(question), answer)
+                logging.info(f"Zaimportowano {imported} odpowiedzi z {self.seed_file}")
+            except Exception as e:
+                logging.error(f"Błąd podczas importu wiedzy z {self.seed_file}: {e}")
+
+    def add_answer(self, question: str, answer: str) -> bool:
+        conn = self._connection()
+        with conn:
+            return bool(self._insert(conn, question, answer))
+
+    def add_many(self, pairs: Iterable[Tuple[str, str]]) -> int:
+        conn = self._connection()
+        with conn:
+            return sum(self._insert(conn, question, answer) for question, answer in pairs)
+
+    @classmethod
+    def _insert(cls, conn: sqlite3.Connection, question: str, answer: str) -> int:
+        cursor = conn.execute("INSERT OR IGNORE INTO questions (question) VALUES (?)", (question,))
+        if cursor.rowcount:
+            cls._index_trigrams(conn, cursor.lastrowid, question)
+        cursor = conn.execute(
+            "INSERT OR IGNORE INTO answers (question_id, answer) "
+            "SELECT id, ? FROM questions WHERE question = ?",
+            (answer, question)
+        )
+        return cursor.rowcount
+
+    @staticmethod
+    def _index_trigrams(conn: sqlite3.Connection, question_id: int, question: str):
+        grams = trigrams(question)
+        conn.executemany(
+            "INSERT OR IGNORE INTO trigrams (gram, question_id) VALUES (?, ?)",
+            [(gram, question_id) for gram in grams]
+        )
+        # Długości list trzymamy osobno - COUNT(*) po liście częstego trigramu to przejście całej listy
+        conn.executemany(
+            "INSERT INTO gram_counts (gram, questions) VALUES (?, 1) "
+            "ON CONFLICT(gram) DO UPDATE SET questions = questions + 1",
+            [(gram,) for gram in grams]
+        )
+        conn.execute("UPDATE questions SET grams = ? WHERE id = ?", (len(grams), question_id))
+
+    def get_answers(self, question: str) -> Optional[List[str]]:
+        rows = self._connection().execute(
+            "SELECT a.answer FROM answers a JOIN questions q ON q.id = a.question_id WHERE q.question = ?",
+            (question,)
+        ).fetchall()
+        return [answer for (answer,) in rows] or None
+
+    def find_similar(self, question: str, threshold: float) -> Optional[str]:
+        # To samo co TrigramIndex.search: najrzadsze listy, odsiew po liczbie trigramów i limity
+        query = list(trigrams(question))
+        conn = self._connection()
+        placeholders = ','.join('?' * len(query))
+        counts = dict(conn.execute(f"SELECT gram, questions FROM gram_counts WHERE gram IN ({placeholders})", query))
+        query.sort(key=lambda gram: counts.get(gram, 0))
+        low, high = size_bounds(len(query), threshold)
+
+        hits: Dict[int, int] = {}
+        budget = MAX_SCANNED_POSTINGS
+        for gram in query[:probe_count(len(query), threshold)]:
+            if not counts.get(gram):
+                continue
+            rows = conn.execute(
+                "SELECT t.question_id FROM (SELECT question_id FROM trigrams WHERE gram = ? LIMIT ?) t "
+                "JOIN questions q ON q.id = t.question_id WHERE q.grams BETWEEN ? AND ?",
+                (gram, budget, low, high)
+            )
+            for (question_id,) in rows:
+                hits[question_id] = hits.get(question_id, 0) + 1
+            budget -= counts[gram]
+            if budget <= 0:
+                break
+        if not hits:
+            return None
+
+        candidates = heapq.nlargest(MAX_CANDIDATES, hits, key=hits.get)
+        # Pokrycie z listy trigramów (punktowe odczyty klucza głównego), bez ponownego rozbijania kandydatów
+        rows = conn.execute(
+            f"SELECT q.question, q.grams, COUNT(*) FROM trigrams t JOIN questions q ON q.id = t.question_id "
+            f"WHERE t.gram IN ({placeholders}) AND t.question_id IN ({','.join('?' * len(candidates))}) "
+            f"GROUP BY t.question_id",
+            (*query, *candidates)
+        ).fetchall()
+
+        best, best_score = None, threshold
+        for candidate, grams, overlap in rows:
+            score = 2 * overlap / (len(query) + grams)
+            if score >= best_score:
+                best, best_score = candidate, score
+        return best
+
+    def iter_entries(self, cursor: int = 0, prefix: str = '',
+                     max_scan: Optional[int] = None) -> Iterator[Tuple[int, Optional[str], Optional[Sequence[str]]]]:
+        # Kursor to id pytania (pytań się nie usuwa, więc id są kolejne - budżet to zakres id).
+        # Osobne połączenie - długi eksport nie dzieli transakcji z zapisami tego wątku
+        conn = sqlite3.connect(self.db_file, timeout=10)
+        upper = cursor + max_scan if max_scan is not None else -1
+        try:
+            rows = conn.execute(
+                "SELECT q.id, q.question, a.answer FROM questions q JOIN answers a ON a.question_id = q.id "
+                "WHERE q.id > ? AND (? < 0 OR q.id <= ?) AND substr(q.question, 1, ?) = ? ORDER BY q.id",
+                (cursor, upper, upper, len(prefix), prefix)
+            )
+            for (question_id, question), group in groupby(rows, key=lambda row: (row[0], row[1])):
+                yield question_id, question, [answer for _, _, answer in group]
+            if upper >= 0 and conn.execute("SELECT 1 FROM questions WHERE id > ?", (upper,)).fetchone():
+                yield upper, None, None
+        finally:
+            conn.close()
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            conn.close()
+        self._local.conn = None
+
+
+def create_storage(backend: str = "json", path: Optional[str] = None) -> KnowledgeStorage:
+    """Tworzy magazyn wiedzy po nazwie backendu ('json', 'sqlite' albo 'mmap')"""
+    if backend == "json":
+        return JsonStorage(path or "dawid_data.json")
+    if backend == "sqlite":
+        return SqliteStorage(path or "dawid_data.db")
+    if backend == "mmap":
+        return MmapStorage(path or "dawid_data.idx")
+    raise ValueError(f"Nieznany backend magazynu wiedzy: {backend}")
@@ -5,11 +5,46 @@ const API_ENDPOINTS = [
   "http://192.168.1.144:5000"       // fallback sieciowy
 ];
 
+const SESSION_STORAGE_KEY = 'dawid_session_id';
+
+// crypto.randomUUID działa tylko w bezpiecznym kontekście (HTTPS/localhost),
+// a frontend bywa serwowany po zwykłym HTTP z adresu w sieci lokalnej
+function generateSessionId() {
+  if (typeof crypto.randomUUID === 'function') {
+    return crypto.randomUUID();
+  }
+  const bytes = crypto.getRandomValues(new Uint8Array(16));
+  bytes[6] = (bytes[6] & 0x0f) | 0x40; // wersja 4
+  bytes[8] = (bytes[8] & 0x3f) | 0x80; // wariant RFC 4122
+  const hex = Array.from(bytes, (byte) => byte.toString(16).padStart(2, '0')).join('');
+  return `${hex.slice(0, 8)}-${hex.slice(8, 12)}-${hex.slice(12, 16)}-${hex.slice(16, 20)}-${hex.slice(20)}`;
+}
 
 class ApiService {
   constructor() {
     this.baseUrl = import.meta.env.VITE_API_URL || API_ENDPOINTS[0];
     this.timeout = 10000; // 10 sekund timeout
+    this.sessionId = this.loadSessionId();
+  }
+
+  // Id sesji rozmowy - backend trzyma po nim stan nauki osobno dla każdego użytkownika
+  loadSessionId() {
+    // sessionStorage bywa niedostępny (np. zablokowane dane witryny) - wtedy id tylko na tę kartę
+    try {
+      const stored = sessionStorage.getItem(SESSION_STORAGE_KEY);
+      if (stored) {
+        return stored;
+      }
+    } catch {
+      return generateSessionId();
+    }
+    const sessionId = generateSessionId();
+    try {
+      sessionStorage.setItem(SESSION_STORAGE_KEY, sessionId);
+    } catch {
+      // Brak zapisu oznacza tylko nową sesję po odświeżeniu strony
+    }
+    return sessionId;
   }
 
   async findWorkingEndpoint() {
@@ -59,7 +94,7 @@ class ApiService {
           headers: {
             'Content-Type': 'application/json',
           },
-          body: JSON.stringify({ message }),
+          body: JSON.stringify({ message, session_id: this.sessionId }),
           signal: controller.signal,
         });
 